@@ -13,18 +13,31 @@ Wymagania:
   playwright install
   pip install google-generativeai   # opcjonalnie, dla Gemini
   pip install openai                # opcjonalnie, dla OpenAI
+  pip install pybloom-live          # opcjonalnie, mniejszy indeks wysłanych przy dużym logu
+  pip install httpx lxml            # opcjonalnie, szybsze zbieranie linków bez renderowania
 """
 from __future__ import annotations
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+import asyncio
 import re
 import csv
 import os
 import json
 import random
 import argparse
-from datetime import datetime
+import atexit
+import functools
+import hashlib
+import io
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from urllib.parse import urljoin, urlsplit
 from zoneinfo import ZoneInfo
-from urllib.parse import urljoin
+
+# Strefa czasowa dla znaczników w logu, limitu dziennego i dat konkursów
+_TZ = ZoneInfo("Europe/Warsaw")
 
 # ===== KONFIGURACJA =====
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
@@ -78,59 +91,274 @@ def ensure_log():
                 "timestamp", "contest_url", "article_url", "question", "answer", "status", "fill_stats"
             ])
 
+# Wiersze trafiają do bufora w pamięci; plik jest otwarty raz na cały przebieg,
+# a bufor dopisywany co LOG_FLUSH_ROWS wierszy i przy zamknięciu. Wiersze wysłanych zgłoszeń
+# są zapisywane od razu — zamknięcie konsoli nie może ich zgubić (ponowne wysłanie, zły limit).
+LOG_FLUSH_ROWS = 10
+
+class Logger:
+    """Długo żyjący zapis LOG_FILE: open() / write(row) / flush() / close() lub `with Logger():`."""
+
+    def __init__(self, path: str = LOG_FILE, flush_rows: int = LOG_FLUSH_ROWS):
+        self.path = path
+        self.flush_rows = flush_rows
+        self._buf: list[list] = []
+        self._f = None
+        self._writer = None
+
+    def open(self) -> "Logger":
+        global _LOGGER
+        if self._f is None:
+            ensure_log()
+            self._f = open(self.path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._f)
+        _LOGGER = self
+        return self
+
+    def write(self, row: list, flush: bool = False):
+        self._buf.append(row)
+        if flush or len(self._buf) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self._buf and self._f is not None:
+            self._writer.writerows(self._buf)
+            self._buf.clear()
+            self._f.flush()
+
+    def close(self):
+        global _LOGGER
+        self.flush()
+        if _LOGGER is self:
+            save_sent_urls()
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if _LOGGER is self:
+            _LOGGER = None
+
+    def __enter__(self) -> "Logger":
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+_LOGGER: Logger | None = None
+
+def _active_logger() -> Logger:
+    """Logger otwarty przez run(); poza nim — domyślny, zamykany przy wyjściu z programu."""
+    if _LOGGER is None:
+        atexit.register(Logger().open().close)
+    return _LOGGER
+
+def flush_log():
+    """Dopisuje zbuforowane wiersze do LOG_FILE (przed czytaniem pliku)."""
+    if _LOGGER is not None:
+        _LOGGER.flush()
+
 def log_row(contest_url: str, article_url: str | None, q: str, a: str, status: str, fill_stats: str = ""):
-    with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerow([
-            datetime.now(ZoneInfo("Europe/Warsaw")).isoformat(), contest_url, article_url or "", q, a, status, fill_stats
-        ])
+    _load_state()
+    ts = datetime.now(_TZ).isoformat(timespec="seconds")
+    _active_logger().write([ts, contest_url, article_url or "", q, a, status, fill_stats],
+                           flush=status in SENT_STATUSES)
+    _index_row(ts, contest_url, status)
+    if status in SENT_STATUSES:
+        _SENT_NEW.append(contest_url)
+    day = ts.partition("T")[0]
+    if status in SENT_STATUSES and day in _SENT_TODAY:
+        _SENT_TODAY[day] += 1
 
 # ===== LIMIT DZIENNY =====
 SENT_STATUSES = {"SENT", "SENT_TEMPLATE", "SENT_EXTRACT", "SENT_YEARS", "SENT_LLM", "SENT_UNCONFIRMED"}
 
-def today_local_iso() -> str:
-    """Lokalna data (Europe/Warsaw) dla zliczania limitu dziennego."""
-    return datetime.now(ZoneInfo("Europe/Warsaw")).date().isoformat()
+# Indeks wysłanych ładowany z SENT_URLS_FILE (plus wiersze dopisane do LOG_FILE od jego zapisu)
+# i aktualizowany przez log_row; pełny skan LOG_FILE tylko, gdy pliku brak lub log się skurczył.
+# Liczniki dzienne (_SENT_TODAY) są liczone osobno z końcówki pliku, przy pierwszym pytaniu o dany dzień.
+# Z pakietem pybloom-live URL-e trafiają do filtra Blooma (~10 bitów/URL), a dokładnie
+# pamiętane jest tylko ostatnie SENT_RECENT_MAX; bez niego _SENT_URLS trzyma wszystkie.
+SENT_RECENT_MAX = 500
+_SENT_BF = None
+_SENT_URLS: dict[str, None] = {}
+# {"log_size": bajty LOG_FILE objęte listą, "urls": [...]}; nowe wysyłki dopisywane przy zamknięciu loggera
+SENT_URLS_FILE = "sent_urls.json"
+_SENT_NEW: list[str] = []
+_SENT_TODAY: dict[str, int] = {}
+# Licznik dnia jest odświeżany z pliku najwyżej raz na godzinę (np. gdy log dopisuje inny proces)
+SENT_TODAY_TTL = 3600
+_SENT_TODAY_AT: dict[str, float] = {}
+_STATE_LOADED = False
 
-def count_today_sent() -> int:
-    """Liczy wpisy w LOG_FILE z dzisiejszą datą lokalną i statusem wysłania."""
-    if not os.path.exists(LOG_FILE):
-        return 0
-    today = today_local_iso()
-    cnt = 0
+def _new_sent_filter():
+    try:
+        from pybloom_live import ScalableBloomFilter
+    except ImportError:
+        return None
+    return ScalableBloomFilter(initial_capacity=10000, error_rate=0.01)
+
+def _index_row(timestamp: str, contest_url: str, status: str):
+    if status not in SENT_STATUSES:
+        return
+    if _SENT_BF is not None:
+        _SENT_BF.add(contest_url)
+        _SENT_URLS.pop(contest_url, None)
+    _SENT_URLS[contest_url] = None
+    if _SENT_BF is not None and len(_SENT_URLS) > SENT_RECENT_MAX:
+        del _SENT_URLS[next(iter(_SENT_URLS))]
+
+def _scan_sent(f) -> list[str]:
+    """Wysłane URL-e z wierszy CSV (nagłówek odpada na statusie)."""
+    urls = []
+    for row in csv.reader(f):
+        if len(row) >= 6 and row[5] in SENT_STATUSES:
+            urls.append(row[1])
+    return urls
+
+def _read_sent_sidecar() -> tuple[list[str], int] | None:
+    try:
+        with open(SENT_URLS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return list(data["urls"]), int(data["log_size"])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[LOG] Błąd odczytu {SENT_URLS_FILE}: {e} — odbudowuję z logu")
+        return None
+
+def _write_sent_sidecar(urls: list[str]):
+    tmp = SENT_URLS_FILE + ".tmp"
+    try:
+        size = os.path.getsize(LOG_FILE) if os.path.exists(LOG_FILE) else 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"log_size": size, "urls": urls}, f, ensure_ascii=False)
+        os.replace(tmp, SENT_URLS_FILE)
+    except Exception as e:
+        print(f"[LOG] Błąd zapisu {SENT_URLS_FILE}: {e}")
+
+def _load_state():
+    """Jednorazowe załadowanie indeksu wysłanych URL-i (SENT_URLS_FILE + przyrost LOG_FILE)."""
+    global _STATE_LOADED, _SENT_BF
+    if _STATE_LOADED:
+        return
+    _STATE_LOADED = True
+    _SENT_BF = _new_sent_filter()
+    log_size = os.path.getsize(LOG_FILE) if os.path.exists(LOG_FILE) else 0
+    side = _read_sent_sidecar()
+    urls: list[str] | None = None
+    tail: list[str] = []
+    if side is not None and side[1] <= log_size:
+        try:
+            # tylko wiersze dopisane po zapisie listy (np. przerwany przebieg)
+            with open(LOG_FILE, "rb") as fb:
+                fb.seek(side[1])
+                tail = _scan_sent(io.TextIOWrapper(fb, encoding="utf-8", newline=""))
+            urls = side[0]
+            _SENT_NEW.extend(tail)
+        except Exception as e:
+            print(f"[LOG] Błąd odczytu końcówki {LOG_FILE}: {e} — pełny skan")
+            tail = []
+    if urls is None:
+        # brak listy, log wyczyszczony/skrócony albo nieczytelna końcówka — pełny skan i nowa lista
+        try:
+            urls = []
+            if log_size:
+                with open(LOG_FILE, "r", encoding="utf-8", errors="replace", newline="") as f:
+                    urls = _scan_sent(f)
+            _write_sent_sidecar(list(dict.fromkeys(urls)))
+        except Exception as e:
+            # nie gub już zapamiętanych wysyłek — lepiej stara lista niż pusta
+            print(f"[LOG] Błąd odczytu {LOG_FILE}: {e}")
+            urls = side[0] if side is not None else []
+    for url in urls:
+        _index_row("", url, "SENT")
+    for url in tail:
+        _index_row("", url, "SENT")
+
+def save_sent_urls():
+    """Dopisuje wysyłki z tego przebiegu do SENT_URLS_FILE (po zapisaniu ich w LOG_FILE)."""
+    if not _SENT_NEW:
+        return
+    flush_log()
+    side = _read_sent_sidecar()
+    old = side[0] if side is not None else []
+    _write_sent_sidecar(list(dict.fromkeys(old + _SENT_NEW)))
+    _SENT_NEW.clear()
+
+def _sent_in_log(url: str) -> bool:
+    """Dokładne sprawdzenie w LOG_FILE — tylko gdy filtr Blooma zgłosi trafienie spoza ostatnich URL-i."""
+    flush_log()
     try:
         with open(LOG_FILE, "r", encoding="utf-8") as f:
             rdr = csv.reader(f)
             _ = next(rdr, None)
             for row in rdr:
-                if not row or len(row) < 6:
-                    continue
-                timestamp = row[0]
-                status = row[5]
-                date_part = (timestamp.split("T")[0]).strip()
-                if date_part == today and status in SENT_STATUSES:
-                    cnt += 1
+                if row and len(row) >= 6 and row[1] == url and row[5] in SENT_STATUSES:
+                    return True
     except Exception:
         pass
-    return cnt
+    return False
 
-def get_already_sent_urls() -> set[str]:
-    """Zwraca zbiór URL-i konkursów, które już zostały wysłane (kiedykolwiek)."""
-    urls: set[str] = set()
+def today_local_iso() -> str:
+    """Lokalna data (Europe/Warsaw) dla zliczania limitu dziennego."""
+    return _local_date_for_minute(int(time.time()) // 60)
+
+@functools.lru_cache(maxsize=1)
+def _local_date_for_minute(_minute: int) -> str:
+    # klucz zmienia się co minutę, więc data jest liczona najwyżej raz na minutę
+    return datetime.now(_TZ).date().isoformat()
+
+# Początek wiersza logu: pełny znacznik czasu ISO i przecinek (nie linia z wnętrza wieloliniowej odpowiedzi)
+_ROW_DATE_RX = re.compile(rb"^(\d{4}-\d{2}-\d{2})T\d{2}:\d{2}:\d{2}[^,\r\n]*,", re.MULTILINE)
+
+def _tail_count_sent(day: str, chunk: int = 64 * 1024) -> int:
+    """Liczy wysyłki z dnia `day`, czytając LOG_FILE od końca blokami po 64 KB.
+    Wiersze są chronologiczne, więc wystarczy dojść do pierwszego wiersza z wcześniejszą datą."""
+    flush_log()
     if not os.path.exists(LOG_FILE):
-        return urls
+        return 0
+    day_b = day.encode("ascii")
     try:
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            rdr = csv.reader(f)
-            _ = next(rdr, None)
-            for row in rdr:
-                if not row or len(row) < 6:
-                    continue
-                status = row[5]
-                if status in SENT_STATUSES:
-                    urls.add(row[1])
+        with open(LOG_FILE, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            start = 0
+            while pos > 0:
+                step = min(chunk, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+                # szukamy tylko w nowym bloku (+ zakładka); dopasowanie na samym początku
+                # bufora może być środkiem wiersza, więc liczy się dopiero przy pos == 0
+                older = [m.start() for m in _ROW_DATE_RX.finditer(buf, 0, step + 64)
+                         if m.group(1) < day_b and (m.start() > 0 or pos == 0)]
+                if older:
+                    start = older[-1]
+                    break
+            cnt = 0
+            for row in csv.reader(io.StringIO(buf[start:].decode("utf-8", errors="replace"))):
+                if len(row) >= 6 and row[0].partition("T")[0].strip() == day and row[5] in SENT_STATUSES:
+                    cnt += 1
+            return cnt
     except Exception:
-        pass
-    return urls
+        return 0
+
+def count_today_sent() -> int:
+    """Liczba wysyłek z dzisiejszą datą lokalną (z końcówki logu, potem z pamięci)."""
+    today = today_local_iso()
+    now = time.monotonic()
+    if today not in _SENT_TODAY or now - _SENT_TODAY_AT[today] > SENT_TODAY_TTL:
+        _SENT_TODAY[today] = _tail_count_sent(today)
+        _SENT_TODAY_AT[today] = now
+    return _SENT_TODAY[today]
+
+def is_already_sent(url: str) -> bool:
+    """Czy konkurs został już kiedykolwiek wysłany."""
+    _load_state()
+    if url in _SENT_URLS:
+        return True
+    if _SENT_BF is None or url not in _SENT_BF:
+        return False
+    return _sent_in_log(url)
 
 # ===== ANTI-DETEKCJA =====
 USER_AGENTS = [
@@ -164,19 +392,19 @@ def human_delay(min_ms: int = 800, max_ms: int = 3000):
     """Losowe opóźnienie symulujące prawdziwego użytkownika."""
     return random.randint(min_ms, max_ms)
 
-def simulate_human_behavior(page):
+async def simulate_human_behavior(page):
     """Symuluje zachowanie człowieka: scrollowanie, ruch myszy."""
     try:
         # Losowy scroll
         scroll_y = random.randint(100, 500)
-        page.mouse.wheel(0, scroll_y)
-        page.wait_for_timeout(human_delay(300, 800))
+        await page.mouse.wheel(0, scroll_y)
+        await page.wait_for_timeout(human_delay(300, 800))
         # Losowy ruch myszy
-        page.mouse.move(random.randint(100, 800), random.randint(100, 500))
-        page.wait_for_timeout(human_delay(200, 600))
+        await page.mouse.move(random.randint(100, 800), random.randint(100, 500))
+        await page.wait_for_timeout(human_delay(200, 600))
         # Scroll z powrotem
-        page.mouse.wheel(0, -scroll_y // 2)
-        page.wait_for_timeout(human_delay(200, 500))
+        await page.mouse.wheel(0, -scroll_y // 2)
+        await page.wait_for_timeout(human_delay(200, 500))
     except Exception:
         pass
 
@@ -189,38 +417,74 @@ EXPIRED_PATTERNS = [
     r"konkurs\s+trwał\s+do",
     r"expired|closed|ended|no longer",
 ]
+# Jedna alternacja = jeden przebieg po tekście strony zamiast sześciu
+_EXPIRED_RX = re.compile("|".join(f"(?:{p})" for p in EXPIRED_PATTERNS), re.IGNORECASE)
+_END_DATE_RX = re.compile(r"\bdo\s+(\d{1,2})[.\-/](\d{1,2})[.\-/](\d{4})")
+_FORM_HINT_RX = re.compile(r"pytanie|odpowiedź|wyślij", re.IGNORECASE)
 
-def is_contest_expired(scope) -> bool:
-    """Sprawdza czy konkurs jest wygasły na podstawie tekstu strony."""
-    try:
-        txt = get_text(scope) or ""
-        for pat in EXPIRED_PATTERNS:
-            if re.search(pat, txt, flags=re.IGNORECASE):
-                return True
-        # Sprawdź datę zakończenia
-        m = re.search(r"do\s+(\d{1,2})[.\-/](\d{1,2})[.\-/](\d{4})", txt)
-        if m:
-            day, month, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
-            try:
-                end_date = datetime(year, month, day, tzinfo=ZoneInfo("Europe/Warsaw"))
-                if datetime.now(ZoneInfo("Europe/Warsaw")) > end_date:
-                    return True
-            except ValueError:
-                pass
-        # Brak formularza = prawdopodobnie wygasły
+def is_contest_expired_from_text(txt: str, today: date | None = None) -> bool:
+    """Wzorce wygaśnięcia i data zakończenia — na gotowym tekście strony.
+    today — data lokalna liczona raz na konkurs (domyślnie: teraz)."""
+    if _EXPIRED_RX.search(txt):
+        return True
+    # Sprawdź datę zakończenia (regex tylko, gdy w tekście w ogóle jest "do")
+    m = _END_DATE_RX.search(txt) if "do" in txt else None
+    if m:
+        day, month, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
         try:
-            if scope.locator("form").count() == 0:
-                if not any(re.search(p, txt, flags=re.IGNORECASE) for p in [r"pytanie", r"odpowiedź", r"wyślij"]):
-                    return True
-        except Exception:
-            pass
-    except Exception:
-        pass
+            end_date = date(year, month, day)
+        except ValueError:
+            return False
+        if today is None:
+            today = datetime.now(_TZ).date()
+        # jak dotąd: po północy dnia końcowego konkurs uznajemy za zakończony
+        if today >= end_date:
+            return True
     return False
 
+def is_contest_expired(txt: str, has_form: bool = True, today: date | None = None) -> bool:
+    """Sprawdza czy konkurs jest wygasły na podstawie tekstu strony (z probe_page)."""
+    if is_contest_expired_from_text(txt, today):
+        return True
+    # Brak formularza = prawdopodobnie wygasły
+    return not has_form and not _FORM_HINT_RX.search(txt)
+
 # ===== INTEGRACJA Z LLM =====
+# Odpowiedzi zapamiętywane w LLM_CACHE_FILE pod skrótem (provider, model, pytanie, kontekst z promptu):
+# powtórka tego samego konkursu (retry) nie kosztuje kolejnego wywołania API.
+LLM_CACHE_FILE = "llm_cache.json"
+LLM_CONTEXT_CHARS = 3000
+_LLM_CACHE: dict[str, str] | None = None
+# ask_llm działa w wątkach (asyncio.to_thread) — odczyt/zapis cache pod blokadą, samo zapytanie bez niej
+_LLM_LOCK = threading.Lock()
+
+def _llm_cache() -> dict[str, str]:
+    global _LLM_CACHE
+    if _LLM_CACHE is None:
+        _LLM_CACHE = {}
+        if os.path.exists(LLM_CACHE_FILE):
+            try:
+                with open(LLM_CACHE_FILE, "r", encoding="utf-8") as f:
+                    _LLM_CACHE = json.load(f)
+            except Exception as e:
+                print(f"[LLM] Błąd odczytu {LLM_CACHE_FILE}: {e} — zaczynam od pustego")
+    return _LLM_CACHE
+
+def _save_llm_cache():
+    tmp = LLM_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_llm_cache(), f, ensure_ascii=False)
+        os.replace(tmp, LLM_CACHE_FILE)
+    except Exception as e:
+        print(f"[LLM] Błąd zapisu {LLM_CACHE_FILE}: {e}")
+
+def _llm_key(provider: str, model: str, question: str, context_text: str) -> str:
+    raw = "\0".join((provider, model, question, context_text[:LLM_CONTEXT_CHARS]))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
 def ask_llm(question: str, context_text: str = "") -> str | None:
-    """Odpowiada na pytanie konkursowe za pomocą LLM (Gemini lub OpenAI)."""
+    """Odpowiada na pytanie konkursowe za pomocą LLM (Gemini lub OpenAI); wynik z cache, jeśli jest."""
     llm_cfg = CFG.get("llm", {})
     if not llm_cfg.get("enabled") or not llm_cfg.get("api_key"):
         return None
@@ -228,14 +492,36 @@ def ask_llm(question: str, context_text: str = "") -> str | None:
     provider = llm_cfg.get("provider", "gemini")
     api_key = llm_cfg["api_key"]
     model = llm_cfg.get("model", "gemini-2.0-flash")
+    key = _llm_key(provider, model, question, context_text)
+    with _LLM_LOCK:
+        cached = _llm_cache().get(key)
+    if cached:
+        print(f"[LLM] Odpowiedź z cache: {cached[:200]}")
+        return cached
+    answer = _ask_llm_uncached(provider, api_key, model, question, context_text)
+    if answer:
+        with _LLM_LOCK:
+            _llm_cache()[key] = answer
+            _save_llm_cache()
+    return answer
 
+def forget_llm_answer(question: str, context_text: str = ""):
+    """Usuwa z cache odpowiedź, która nie przeszła (NOT_SENT) — przy retry pytamy LLM od nowa."""
+    llm_cfg = CFG.get("llm", {})
+    key = _llm_key(llm_cfg.get("provider", "gemini"), llm_cfg.get("model", "gemini-2.0-flash"),
+                   question, context_text)
+    with _LLM_LOCK:
+        if _llm_cache().pop(key, None) is not None:
+            _save_llm_cache()
+
+def _ask_llm_uncached(provider: str, api_key: str, model: str, question: str, context_text: str) -> str | None:
     prompt = (
         "Jesteś ekspertem od konkursów wiedzy. Odpowiedz krótko i konkretnie na pytanie konkursowe. "
         "Jeśli pytanie dotyczy roku lub daty, podaj dokładną liczbę. "
         "Jeśli pytanie prosi o wymienienie kroków, podaj je numerowane.\n\n"
     )
     if context_text:
-        prompt += f"Kontekst z artykułu:\n{context_text[:3000]}\n\n"
+        prompt += f"Kontekst z artykułu:\n{context_text[:LLM_CONTEXT_CHARS]}\n\n"
     prompt += f"Pytanie: {question}\n\nOdpowiedź:"
 
     try:
@@ -281,47 +567,59 @@ def _ask_openai(api_key: str, model: str, prompt: str) -> str | None:
         return None
 
 # ===== POMOCNICZE =====
-COOKIE_NOISE = {
+COOKIE_NOISE = frozenset({
     "cookies", "ciasteczka", "zgoda", "preferencje", "prywatności", "privacy", "rodo",
     "personalized ads", "spersonalizowane reklamy", "pomiar reklam", "badanie odbiorców", "ulepszanie usług"
-}
-NOISE_WORDS = {
+})
+NOISE_WORDS = frozenset({
     "informacje", "wywiady", "ludzie", "badania rynku", "wydarzenia branżowe",
     "multimedia", "ogłoszenia o pracę", "zdobywcy eteru", "kontakt", "czytaj także",
     "reklama", "tagi", "udostępnij"
-}
-ACTION_KEYWORDS = {
+})
+ACTION_KEYWORDS = frozenset({
     "analiza", "projekt", "architekt", "wdrożenie", "implementacja", "konfiguracja",
     "test", "testy", "plan", "przygotowanie", "publikacja", "prototyp", "makiet",
     "badanie", "weryfikacja", "monitoring", "rollback", "release", "deploy",
-}
+})
+
+def _words_rx(words) -> re.Pattern:
+    """Kompiluje zbiór fraz do jednej alternacji (jeden przebieg po tekście)."""
+    return re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)), re.IGNORECASE)
+
+# Zbiory wyżej zostają źródłem prawdy (przekazywane też do JS); tu ich skompilowane odpowiedniki
+_NOISE_RX = _words_rx(NOISE_WORDS | COOKIE_NOISE)
+_ACTION_RX = _words_rx(ACTION_KEYWORDS)
 
 def compute_years_ago(year: int) -> int:
-    return datetime.now(ZoneInfo("Europe/Warsaw")).year - year
+    return datetime.now(_TZ).year - year
 
-def get_text(scope) -> str:
+async def get_text(scope) -> str:
     try:
-        return scope.locator("body").inner_text()
+        return await scope.locator("body").inner_text()
     except Exception:
         try:
-            return scope.inner_text()
+            return await scope.inner_text()
         except Exception:
             return ""
 
-def text_is_noise(t: str) -> bool:
-    low = t.lower()
-    return any(w in low for w in COOKIE_NOISE) or len(t.strip()) < 5
+def line_is_noise(t_low: str) -> bool:
+    """t_low — tekst już małymi literami; odrzuca cookies, NOISE_WORDS (nawigacja, stopki) i krótkie linie."""
+    return bool(_NOISE_RX.search(t_low)) or len(t_low.strip()) < 5
+
+_QUESTION_RX = re.compile(r"Pytanie\s+konkursowe:\s*(.+)", re.IGNORECASE)
+_HINT_QUESTION_RX = re.compile(r"(Podpowiedź\s+na\s+poprzedniej\s+stronie.*)", re.IGNORECASE)
+# Pytanie odsyła do artykułu (kroki z poprzedniej strony)
+_RE_PREV_PAGE = re.compile(r"poprzedniej stronie", re.IGNORECASE)
 
-def get_question(scope) -> str | None:
-    t = get_text(scope)
+def get_question_from_text(t: str) -> str | None:
     if not t:
         return None
-    m = re.search(r"Pytanie\s+konkursowe:\s*(.+)", t, flags=re.IGNORECASE)
+    m = _QUESTION_RX.search(t)
     if m:
         q = m.group(1).strip()
         q = q.splitlines()[0].strip() if q else q
         return q
-    m2 = re.search(r"(Podpowiedź\s+na\s+poprzedniej\s+stronie.*)", t, flags=re.IGNORECASE)
+    m2 = _HINT_QUESTION_RX.search(t)
     if m2:
         q = m2.group(1).strip()
         q = q.splitlines()[0].strip() if q else q
@@ -334,50 +632,58 @@ def get_question(scope) -> str | None:
     return None
 
 # ===== MAPA PYTAŃ -> ROK =====
+_YEAR_RX = re.compile(r"(18|19|20)\d{2}")
+
+# Reguła = lista grup fraz; pasuje, gdy w pytaniu jest co najmniej jedna fraza z każdej grupy
+_YEAR_TABLE: list[tuple[tuple[tuple[str, ...], ...], int]] = [
+    ((("fantomas", "fantômas"),), 1964),
+    ((("discovery channel",),), 1985),
+    ((("tanita tikaram",),), 1969),
+    ((("groteska",), ("teatr",)), 1945),
+    ((("new york world",), ("krzyżów", "crossword")), 1913),
+    ((("nie ma róży bez ognia",),), 1974),
+    ((("w labiryncie",), ("pierwszy", "pierwszego", "odcinek")), 1988),
+]
+
 def resolve_year(question: str) -> int | None:
-    ql = (question or "").lower()
-    if "fantomas" in ql or "fantômas" in ql:
-        return 1964
-    if "discovery channel" in ql:
-        return 1985
-    if "tanita tikaram" in ql:
-        return 1969
-    if "groteska" in ql and "teatr" in ql:
-        return 1945
-    if "new york world" in ql and ("krzyżów" in ql or "crossword" in ql):
-        return 1913
-    if "nie ma róży bez ognia" in ql:
-        return 1974
-    if "w labiryncie" in ql and ("pierwszy" in ql or "pierwszego" in ql or "odcinek" in ql):
-        return 1988
-    m = re.search(r"(18|19|20)\d{2}", ql)
+    ql = " ".join((question or "").lower().split())
+    return _resolve_year_normalized(ql)
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_year_normalized(ql: str) -> int | None:
+    for groups, year in _YEAR_TABLE:
+        if all(any(term in ql for term in group) for group in groups):
+            return year
+    m = _YEAR_RX.search(ql)
     return int(m.group(0)) if m else None
 
 # ===== Cookies/CMP =====
-def dismiss_cookies_any(scope) -> bool:
+COOKIE_BUTTON_SELECTORS = [
+    "button:has-text('Akceptuję')",
+    "button:has-text('Zgadzam się')",
+    "button:has-text('OK')",
+    "button:has-text('Rozumiem')",
+    "button:has-text('Accept')",
+    "button:has-text('I agree')",
+    "button:has-text('Przejdź dalej')",
+    "a:has-text('Akceptuję')",
+    "a:has-text('Zgadzam się')",
+]
+# Jeden lokator na wszystkie warianty; :visible pomija ukryte duplikaty wcześniej w DOM
+_COOKIE_BUTTONS = ", ".join(f"{sel}:visible" for sel in COOKIE_BUTTON_SELECTORS)
+
+async def dismiss_cookies_any(scope) -> bool:
     """Zamyka CMP/banery cookies w danym scope (page/iframe)."""
-    selectors = [
-        "button:has-text('Akceptuję')",
-        "button:has-text('Zgadzam się')",
-        "button:has-text('OK')",
-        "button:has-text('Rozumiem')",
-        "button:has-text('Accept')",
-        "button:has-text('I agree')",
-        "button:has-text('Przejdź dalej')",
-        "a:has-text('Akceptuję')",
-        "a:has-text('Zgadzam się')",
-    ]
     closed = False
-    for sel in selectors:
-        try:
-            loc = scope.locator(sel)
-            if loc.count() > 0 and loc.first.is_visible():
-                loc.first.click(timeout=800)
-                closed = True
-        except Exception:
-            pass
     try:
-        scope.locator("[aria-label*='zgoda'], [class*='cookie'], [id*='cookie']").evaluate_all(
+        loc = scope.locator(_COOKIE_BUTTONS)
+        if await loc.count() > 0:
+            await loc.first.click(timeout=800)
+            closed = True
+    except Exception:
+        pass
+    try:
+        await scope.locator("[aria-label*='zgoda'], [class*='cookie'], [id*='cookie']").evaluate_all(
             "els => els.forEach(el => el.style.display='none')"
         )
     except Exception:
@@ -385,16 +691,16 @@ def dismiss_cookies_any(scope) -> bool:
     return closed
 
 # ===== Iframe/form detection =====
-def find_form_frame(page):
+async def find_form_frame(page):
     try:
-        if page.locator("form").count() > 0:
+        if await page.locator("form").count() > 0:
             return page
     except Exception:
         pass
     try:
         for fr in page.frames:
             try:
-                txt = get_text(fr)
+                txt = await get_text(fr)
                 if any(x in txt for x in [
                     "Imię", "Nazwisko", "Adres e-mail", "Miasto", "Twoja odpowiedź", "Pytanie konkursowe",
                     "first name", "last name", "email", "city", "answer"
@@ -407,132 +713,341 @@ def find_form_frame(page):
     return page
 
 # ===== Potwierdzenie wysyłki =====
-def has_submission_confirmation(scope) -> bool:
+CONFIRM_PATTERNS = [
+    r"dziękujemy", r"twoje zgłoszenie zostało wysłane", r"zgłoszenie przyjęte",
+    r"wysłano", r"formularz został wysłany",
+    r"thank you", r"submission received", r"succe(ss|s)", r"submitted"
+]
+_CONFIRM_RX = re.compile("|".join(f"(?:{p})" for p in CONFIRM_PATTERNS), re.IGNORECASE)
+_CONFIRM_URL_RX = re.compile(r"(sent|success|dziekujemy|wyslane|submitted)", re.IGNORECASE)
+
+def has_submission_confirmation_from_text(txt: str, url: str = "") -> bool:
+    return bool(_CONFIRM_RX.search(txt or "")) or bool(_CONFIRM_URL_RX.search(url or ""))
+
+async def has_submission_confirmation(scope) -> bool:
     try:
-        txt = get_text(scope) or ""
-        patterns = [
-            r"dziękujemy", r"twoje zgłoszenie zostało wysłane", r"zgłoszenie przyjęte",
-            r"wysłano", r"formularz został wysłany",
-            r"thank you", r"submission received", r"succe(ss|s)", r"submitted"
-        ]
-        if any(re.search(pat, txt, flags=re.IGNORECASE) for pat in patterns):
-            return True
+        txt = await get_text(scope) or ""
     except Exception:
-        pass
+        txt = ""
     try:
         u = scope.url if hasattr(scope, "url") else ""
-        if re.search(r"(sent|success|dziekujemy|wyslane|submitted)", u, flags=re.IGNORECASE):
-            return True
     except Exception:
-        pass
-    return False
+        u = ""
+    return has_submission_confirmation_from_text(txt, u)
+
+# Ten sam wzorzec jako selektor tekstowy Playwright (składnia RegExp)
+_CONFIRM_SELECTOR = f"text=/{_CONFIRM_RX.pattern}/i"
+
+async def wait_for_submission_confirmation(page, scope, timeout: int = 5000) -> bool:
+    """Czeka na tekst potwierdzenia lub adres strony sukcesu — co pojawi się pierwsze.
+    Gdy oba oczekiwania zawiodą (timeout, odłączona ramka), sprawdza bieżącą treść."""
+    pending = {
+        asyncio.ensure_future(scope.wait_for_selector(_CONFIRM_SELECTOR, timeout=timeout)),
+        asyncio.ensure_future(page.wait_for_url(_CONFIRM_URL_RX, wait_until="commit", timeout=timeout)),
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(t.exception() is None for t in done):
+                return True
+    finally:
+        for t in pending:
+            t.cancel()
+    return await has_submission_confirmation(scope)
 
 # ===== Skany zawartości artykułu =====
 CONTENT_SELECTORS = [
     "article", ".article", "main", ".entry-content", ".content", ".post", ".single-article", ".news-entry",
 ]
 
-def get_main_text(page) -> str:
+async def get_main_text(page) -> str:
     for sel in CONTENT_SELECTORS:
         try:
             loc = page.locator(sel)
-            if loc.count() > 0:
-                txt = loc.first.inner_text()
+            if await loc.count() > 0:
+                txt = await loc.first.inner_text()
                 if txt and len(txt.strip()) > 50:
                     return txt
         except Exception:
             pass
     try:
-        return page.locator("body").inner_text()
+        return await page.locator("body").inner_text()
     except Exception:
         return ""
 
 # ===== Nawigacja z retry =====
-def safe_goto(page, url: str, timeout: int = 20000, retries: int = 2) -> bool:
-    """Nawiguje do URL z retry przy błędach sieciowych."""
+# Elementy, z których faktycznie czytamy — gdy któryś jest w DOM, nie czekamy na pełne załadowanie
+CONTENT_READY_SELECTOR = "article, main, form, .entry-content"
+
+async def safe_goto(page, url: str, timeout: int = 5000, retries: int = 2,
+                    ready_selector: str = CONTENT_READY_SELECTOR, ready_timeout: int = 4000,
+                    wait_until: str = "commit") -> bool:
+    """Nawiguje do URL z retry przy błędach sieciowych.
+    Domyślnie czeka tylko na odpowiedź serwera (commit) i pojawienie się treści — przy
+    zbieraniu linków evaluate pracuje na tym, co już zostało sparsowane. Strony konkursów
+    podają wait_until="domcontentloaded" (i dłuższy timeout) — sprawdzenie wygaśnięcia
+    potrzebuje całego formularza."""
     for attempt in range(retries + 1):
         try:
-            page.goto(url, timeout=timeout)
-            page.wait_for_load_state("domcontentloaded")
+            await page.goto(url, wait_until=wait_until, timeout=timeout)
+            try:
+                await page.wait_for_selector(ready_selector, timeout=ready_timeout)
+            except PlaywrightTimeout:
+                pass
             return True
         except Exception as e:
             if attempt < retries:
                 print(f"[RETRY] Błąd nawigacji ({attempt+1}/{retries}): {e}")
-                page.wait_for_timeout(2000)
+                await page.wait_for_timeout(2000)
             else:
                 print(f"[ERR] Nie udało się załadować: {url} — {e}")
                 return False
     return False
 
+# ===== Blokowanie zbędnych zasobów =====
+# Do skanowania artykułów potrzebny jest tylko tekst i linki. Konteksty z formularzem
+# blokują obrazy/media/fonty i trackery, ale zostawiają style — wpływają na testy widoczności pól.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+CONTEST_BLOCKED_RESOURCE_TYPES = BLOCKED_RESOURCE_TYPES - {"stylesheet"}
+TRACKER_HOSTS = [
+    "googletagmanager", "google-analytics", "doubleclick", "googlesyndication", "adservice.google",
+    "facebook", "hotjar", "gemius", "criteo", "taboola", "outbrain", "adnxs", "scorecardresearch",
+]
+# Dopasowywane do hosta, nie całego URL — slugi artykułów bywają w stylu ".../gemius-pbi-wyniki.html"
+_TRACKER_RX = re.compile("|".join(re.escape(h) for h in TRACKER_HOSTS), re.IGNORECASE)
+# Zasoby CAPTCHA (w tym obrazki zadań) muszą dojść, żeby dało się ją rozwiązać ręcznie
+_CAPTCHA_HOST_RX = re.compile(r"recaptcha|hcaptcha", re.IGNORECASE)
+
+def _request_blocker(blocked_types: set[str]):
+    """Handler dla route("**/*"): przerywa zasoby z blocked_types i trackery (nigdy dokumentów)."""
+    async def handler(route):
+        req = route.request
+        try:
+            kind = req.resource_type
+            if kind != "document" and (
+                    (kind in blocked_types and not _CAPTCHA_HOST_RX.search(req.url))
+                    or _TRACKER_RX.search(urlsplit(req.url).hostname or "")):
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+    return handler
+
+block_heavy_requests = _request_blocker(BLOCKED_RESOURCE_TYPES)
+block_contest_requests = _request_blocker(CONTEST_BLOCKED_RESOURCE_TYPES)
+
+# ===== Pula stron =====
+class PagePool:
+    """Stała pula "ciepłych" stron w jednym kontekście, współdzielona przez workery."""
+
+    def __init__(self, context, pages: list):
+        self.context = context
+        self.pages = pages
+        self._free: asyncio.Queue = asyncio.Queue()
+        for pg in pages:
+            self._free.put_nowait(pg)
+
+    @classmethod
+    async def create(cls, context, size: int = 5, block_resources: bool = True) -> "PagePool":
+        pages = []
+        for _ in range(max(1, size)):
+            pg = await context.new_page()
+            await pg.add_init_script(STEALTH_JS)
+            if block_resources:
+                await pg.route("**/*", block_heavy_requests)
+            pages.append(pg)
+        return cls(context, pages)
+
+    @property
+    def size(self) -> int:
+        return len(self.pages)
+
+    @asynccontextmanager
+    async def acquire(self):
+        page = await self._free.get()
+        try:
+            yield page
+        finally:
+            # zwolnij pamięć dokumentu, ale zachowaj stronę do ponownego użycia — zwrot do puli
+            # także przy anulowaniu w trakcie goto (wczesny stop w collect_form_pairs)
+            try:
+                await page.goto("about:blank")
+            except Exception:
+                pass
+            finally:
+                self._free.put_nowait(page)
+
+    async def close(self):
+        for pg in self.pages:
+            try:
+                await pg.close()
+            except Exception:
+                pass
+
+# ===== Linki: filtr i deduplikacja po stronie przeglądarki =====
+# Wzorce są przekazywane do JS jako .pattern — składnia zgodna z RegExp.
+_ART_LINK_RX = re.compile(r"/art/\d+/.+\.html/?$")
+_KONKURS_LINK_RX = re.compile(r"/konkursy/\d+/.+\.html/?$")
+# Nazwy linków — wspólne dla get_by_role (Playwright) i ścieżki HTTP.
+_NEXT_PAGE_RX = re.compile("następna", re.IGNORECASE)
+_TAKE_PART_RX = re.compile("Biorę udział w konkursie", re.IGNORECASE)
+
+LINKS_JS = """
+(args) => {
+  const rx = new RegExp(args.pattern);
+  const out = new Set();
+  for (const a of document.querySelectorAll('a')) {
+    const href = a.getAttribute('href');
+    if (!href) continue;
+    let full;
+    try { full = new URL(href, args.base).href; } catch (e) { continue; }
+    if (rx.test(full)) out.add(full);
+  }
+  return Array.from(out);
+}
+"""
+
+async def matching_links(page, base: str, pattern: str) -> list[str]:
+    """Zwraca unikalne absolutne URL-e linków pasujących do wzorca (jedno evaluate)."""
+    try:
+        return await page.evaluate(LINKS_JS, {"base": base, "pattern": pattern})
+    except Exception:
+        return []
+
 # ===== 1) Zbierz linki ARTYKUŁÓW z listy =====
-def collect_article_links(page, max_pages: int = 3) -> list[str]:
-    arts: set[str] = set()
+async def collect_article_links(page, max_pages: int = 3) -> list[str]:
+    # dict jako zbiór z zachowaniem kolejności na liście (najnowsze artykuły najpierw)
+    arts: dict[str, None] = {}
     for page_idx in range(max_pages):
         if page_idx == 0:
-            if not safe_goto(page, LIST_URL):
+            if not await safe_goto(page, LIST_URL):
                 break
-        dismiss_cookies_any(page)
-        page.wait_for_load_state("domcontentloaded")
-        page.wait_for_timeout(1200)
+        await dismiss_cookies_any(page)
+        await page.wait_for_load_state("domcontentloaded")
+        await page.wait_for_timeout(1200)
         try:
-            page.locator("body").evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(800)
+            await page.locator("body").evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+            await page.wait_for_timeout(800)
         except Exception:
             pass
-        try:
-            hrefs = page.evaluate("() => Array.from(document.querySelectorAll('a')).map(a => a.getAttribute('href') || '')")
-        except Exception:
-            hrefs = []
-        for href in hrefs:
-            if not href:
-                continue
-            full = urljoin(LIST_URL, href)
-            if re.search(r"/art/\d+/.+\.html/?$", full):
-                arts.add(full)
+        for full in await matching_links(page, LIST_URL, _ART_LINK_RX.pattern):
+            arts.setdefault(full, None)
         clicked_next = False
         for selector in [
-            ("role", "link", re.compile("następna", re.IGNORECASE)),
+            ("role", "link", _NEXT_PAGE_RX),
             ("css", "a:has-text('następna')", None)
         ]:
             try:
                 if selector[0] == "role":
-                    page.get_by_role(selector[1], name=selector[2]).click(timeout=2000)
+                    await page.get_by_role(selector[1], name=selector[2]).click(timeout=2000)
                 else:
-                    page.locator(selector[1]).click(timeout=2000)
+                    await page.locator(selector[1]).click(timeout=2000)
                 clicked_next = True
                 break
             except Exception:
                 pass
         if not clicked_next:
             break
-    return sorted(list(arts))
+    return list(arts)
 
-# ===== 2) Z artykułu wyciągnij pary (FORM, ART) =====
-def extract_form_pairs_from_article(page, article_url: str) -> list[tuple[str, str]]:
-    pairs: list[tuple[str, str]] = []
-    if not safe_goto(page, article_url):
-        return pairs
-    dismiss_cookies_any(page)
-    page.wait_for_timeout(800)
+# ===== 1a) Lista i artykuły przez HTTP (httpx + lxml, opcjonalnie) =====
+# Strony listy i artykułów są statycznym HTML — bez renderowania w Chromium.
+# None z tych funkcji oznacza "użyj Playwright" (brak pakietów, błąd sieci, strona SPA).
+_SPA_MARKER_RX = re.compile(r"""<div[^>]+id=["'](?:app|root|__next)["']""", re.IGNORECASE)
+
+def new_http_client(user_agent: str):
+    """httpx.AsyncClient z nagłówkami przeglądarki; None, gdy brak httpx/lxml."""
     try:
-        hrefs = page.evaluate("() => Array.from(document.querySelectorAll('a')).map(a => a.getAttribute('href') || '')")
-    except Exception:
-        hrefs = []
-    for href in hrefs:
+        import httpx
+        import lxml.html  # noqa: F401
+    except ImportError:
+        print("[HTTP] Brak httpx/lxml — linki zbieram przez Playwright. Zainstaluj: pip install httpx lxml")
+        return None
+    return httpx.AsyncClient(
+        headers={"User-Agent": user_agent, "Accept-Language": "pl-PL,pl;q=0.9"},
+        follow_redirects=True,
+        timeout=10.0,
+    )
+
+async def fetch_doc(client, url: str):
+    """Pobiera stronę i zwraca (drzewo lxml, surowy HTML) albo None przy błędzie."""
+    from lxml import html as lxml_html
+    try:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        # resp.text — dekodowanie wg nagłówków/meta charset, nie domyślne latin-1 lxml
+        return lxml_html.fromstring(resp.text, base_url=str(resp.url)), resp.text
+    except Exception as e:
+        print(f"[HTTP] {url}: {e}")
+        return None
+
+def doc_links(doc, rx: re.Pattern, text_rx: re.Pattern | None = None) -> list[str]:
+    """Unikalne absolutne URL-e linków pasujących do rx (lub do tekstu text_rx), w kolejności."""
+    out: dict[str, None] = {}
+    for a in doc.iter("a"):
+        href = (a.get("href") or "").strip()
         if not href:
             continue
-        full = urljoin(article_url, href)
-        if re.search(r"/konkursy/\d+/.+\.html/?$", full):
-            pairs.append((full, article_url))
+        full = urljoin(doc.base_url, href)
+        if text_rx is not None:
+            if text_rx.search(a.text_content()):
+                out.setdefault(full, None)
+        elif rx.search(full):
+            out.setdefault(full, None)
+    return list(out)
+
+async def collect_article_links_http(client, max_pages: int = 3) -> list[str] | None:
+    arts: dict[str, None] = {}
+    url = LIST_URL
+    for page_idx in range(max_pages):
+        got = await fetch_doc(client, url)
+        if got is None:
+            return None if page_idx == 0 else list(arts)
+        doc, _ = got
+        found = doc_links(doc, _ART_LINK_RX)
+        if page_idx == 0 and not found:
+            # brak linków w surowym HTML (SPA, blokada) — niech wyrenderuje przeglądarka
+            return None
+        for full in found:
+            arts.setdefault(full, None)
+        nxt = doc_links(doc, None, text_rx=_NEXT_PAGE_RX)
+        if not nxt:
+            break
+        url = nxt[0]
+    return list(arts)
+
+async def extract_form_pairs_http(client, article_url: str) -> list[tuple[str, str]] | None:
+    got = await fetch_doc(client, article_url)
+    if got is None:
+        return None
+    doc, raw = got
+    forms = doc_links(doc, _KONKURS_LINK_RX)
+    forms += [u for u in doc_links(doc, None, text_rx=_TAKE_PART_RX) if "konkursy/" in u]
+    if "konkursy/" in doc.base_url and doc.xpath("//form"):
+        forms.append(doc.base_url)
+    if not forms and _SPA_MARKER_RX.search(raw):
+        return None
+    return [(form, article_url) for form in dict.fromkeys(forms)]
+
+# ===== 2) Z artykułu wyciągnij pary (FORM, ART) =====
+async def extract_form_pairs_from_article(page, article_url: str) -> list[tuple[str, str]]:
+    pairs: list[tuple[str, str]] = []
+    if not await safe_goto(page, article_url):
+        return pairs
+    await dismiss_cookies_any(page)
+    await page.wait_for_timeout(800)
+    for full in await matching_links(page, article_url, _KONKURS_LINK_RX.pattern):
+        pairs.append((full, article_url))
     try:
-        page.get_by_role("link", name=re.compile("Biorę udział w konkursie", re.IGNORECASE)).click(timeout=1500)
-        page.wait_for_load_state("domcontentloaded")
+        await page.get_by_role("link", name=_TAKE_PART_RX).click(timeout=1500)
+        await page.wait_for_load_state("domcontentloaded")
         if "konkursy/" in page.url:
             pairs.append((page.url, article_url))
     except Exception:
         pass
     try:
-        if page.locator("form").count() > 0 and "konkursy/" in page.url:
+        if await page.locator("form").count() > 0 and "konkursy/" in page.url:
             pairs.append((page.url, article_url))
     except Exception:
         pass
@@ -544,197 +1059,274 @@ def extract_form_pairs_from_article(page, article_url: str) -> list[tuple[str, s
             unique.append((form, art))
     return unique
 
-# ===== Heurystyka: kroki blisko słów kluczowych =====
-def extract_steps_near_keywords(page, max_items: int = 3) -> list[str]:
-    steps: list[str] = []
-    body_text = get_main_text(page)
-    lines = [l.strip() for l in body_text.splitlines() if l.strip()]
-    lines = [l for l in lines if not any(nw in l.lower() for nw in NOISE_WORDS) and not text_is_noise(l)]
-    anchor_idx = None
-    keywords = (
-        "proces projektowania", "krok", "etap", "step", "jak wygląda proces",
-        "proces testowania", "proces wdrażania", "publikacja"
-    )
-    for i, l in enumerate(lines):
-        if any(kw in l.lower() for kw in keywords):
-            anchor_idx = i
-            break
-    if anchor_idx is not None:
-        for l in lines[anchor_idx:anchor_idx + 30]:
-            if re.match(r"^(\d+[\.)]\s+|[\-•—]\s+)", l):
-                candidate = re.sub(r"^(\d+[\.)]\s+|[\-•—]\s+)", "", l).strip()
-            else:
-                candidate = l
-            low = candidate.lower()
-            if any(nw in low for nw in NOISE_WORDS) or text_is_noise(candidate):
-                continue
-            if not any(ak in low for ak in ACTION_KEYWORDS):
-                continue
-            if 5 <= len(candidate) <= 180:
-                steps.append(candidate)
-            if len(steps) >= max_items:
+async def collect_form_pairs(pool: PagePool, article_links: list[str],
+                             limit: int | None = None, client=None) -> list[tuple[str, str]]:
+    """Równolegle wyciąga pary z artykułów (współbieżność ograniczona rozmiarem puli).
+
+    Wyniki są konsumowane w miarę ukończenia (as_completed), ale składane w kolejności
+    artykułów. Gdy znany prefiks listy daje już `limit` niewysłanych formularzy,
+    pozostałe pobrania są anulowane. Z klientem HTTP artykuł próbowany jest najpierw
+    bez przeglądarki.
+    """
+    # ta sama współbieżność dla HTTP, co dla puli stron
+    http_sem = asyncio.Semaphore(pool.size)
+
+    async def scrape(idx: int, art: str) -> tuple[int, list[tuple[str, str]]]:
+        if client is not None:
+            async with http_sem:
+                found = await extract_form_pairs_http(client, art)
+            if found is not None:
+                return idx, found
+        # pula stron działa jak semafor sieciowy — najwyżej pool.size pobrań naraz
+        try:
+            async with pool.acquire() as page:
+                return idx, await extract_form_pairs_from_article(page, art)
+        except Exception as e:
+            print(f"[ERR] Ekstrakcja par z {art}: {e}")
+            return idx, []
+
+    done: dict[int, list[tuple[str, str]]] = {}
+    pairs: list[tuple[str, str]] = []
+    fresh: set[str] = set()
+    next_idx = 0
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(scrape(i, art)) for i, art in enumerate(article_links)]
+        for fut in asyncio.as_completed(tasks):
+            idx, found = await fut
+            done[idx] = found
+            # dołączaj tylko ciągły prefiks, żeby zachować kolejność artykułów
+            while next_idx in done:
+                for form, art in done.pop(next_idx):
+                    pairs.append((form, art))
+                    if not is_already_sent(form):
+                        fresh.add(form)
+                next_idx += 1
+            if limit and len(fresh) >= limit:
+                pending = sum(not t.done() for t in tasks)
+                if pending:
+                    print(f"[INFO] Mam {len(fresh)} nowych formularzy — pomijam {pending} artykułów.")
+                for t in tasks:
+                    t.cancel()
                 break
-    return steps[:max_items]
+    return pairs
 
 # ===== 3) Ekstrakcja 3 kroków z artykułu =====
-def extract_three_steps_from_article(context, article_url: str) -> list[str]:
-    art_page = context.new_page()
-    steps: list[str] = []
-    try:
-        if not safe_goto(art_page, article_url):
-            return steps
-        dismiss_cookies_any(art_page)
-        art_page.wait_for_timeout(800)
-        # 1) <ol><li>
-        try:
-            lis_ol = art_page.locator("ol li")
-            for i in range(min(3, lis_ol.count())):
-                txt = lis_ol.nth(i).inner_text().strip()
-                if txt and len(txt) > 4 and not text_is_noise(txt):
-                    steps.append(txt)
-        except Exception:
-            pass
-        if len(steps) >= 3:
-            return steps[:3]
-        # 2) <ul><li>
-        try:
-            lis_ul = art_page.locator("ul li")
-            idx = 0
-            while len(steps) < 3 and idx < lis_ul.count():
-                txt = lis_ul.nth(idx).inner_text().strip()
-                low = txt.lower()
-                if (txt and len(txt) > 4
-                    and not any(nw in low for nw in NOISE_WORDS)
-                    and not text_is_noise(txt)
-                    and any(ak in low for ak in ACTION_KEYWORDS)):
-                    steps.append(txt)
-                idx += 1
-        except Exception:
-            pass
-        if len(steps) >= 3:
-            return steps[:3]
-        # 3) akapity/numeracje
-        try:
-            paras = art_page.locator("p, li, div")
-            for i in range(paras.count()):
-                txt = paras.nth(i).inner_text().strip()
-                low = txt.lower()
-                if text_is_noise(txt):
-                    continue
-                if re.match(r"^(Krok|Etap|Step)\s*\d+[\:\-\.\) ]\s+", txt, flags=re.IGNORECASE):
-                    steps.append(txt)
-                elif re.match(r"^\d+[\.\)]\s+", txt) and not any(nw in low for nw in NOISE_WORDS):
-                    steps.append(txt)
-                if len(steps) >= 3:
-                    break
-        except Exception:
-            pass
-        if len(steps) >= 3:
-            return steps[:3]
-        # 4) nagłówki -> sąsiednie
-        try:
-            heads = art_page.locator("h2, h3, h4")
-            for i in range(heads.count()):
-                htxt = heads.nth(i).inner_text().strip()
-                if re.search(r"(proces|etap|krok|test|wdrażanie|publikacja)", htxt, flags=re.IGNORECASE):
-                    nearby = art_page.locator("p, li")
-                    for j in range(nearby.count()):
-                        t = nearby.nth(j).inner_text().strip()
-                        low = t.lower()
-                        if t and len(t) > 4 and not any(nw in low for nw in NOISE_WORDS) and not text_is_noise(t):
-                            steps.append(t)
-                        if len(steps) >= 3:
-                            break
-                if len(steps) >= 3:
-                    break
-        except Exception:
-            pass
-        if len(steps) >= 3:
-            return steps[:3]
-        # 5) blisko słów kluczowych
-        if len(steps) < 3:
-            steps_near = extract_steps_near_keywords(art_page, max_items=3)
-            if steps_near:
-                return steps_near
-        # 6) regex fallback
-        body_text = get_main_text(art_page)
-        if len(steps) < 3 and body_text:
-            candidates = re.findall(r"(?:Krok|Etap)\s*\d+[\:\-\.\) ]\s*(.+)", body_text, flags=re.IGNORECASE)
-            for c in candidates:
-                c = c.strip()
-                low = c.lower()
-                if c and not any(nw in low for nw in NOISE_WORDS) and not text_is_noise(c):
-                    steps.append(c)
-                if len(steps) >= 3:
-                    break
-        return steps[:3]
-    finally:
+# Jedno evaluate zbiera surowych kandydatów (listy, akapity, sąsiedztwo nagłówków
+# o procesie/krokach, tekst główny); ocena i wybór 3 najlepszych odbywa się w Pythonie.
+ARTICLE_STEPS_JS = """
+(args) => {
+  const seen = new Set();
+  const take = (el) => {
+    const t = (el.innerText || '').trim();
+    if (t.length < args.minLen || t.length > args.maxLen || seen.has(t)) return null;
+    seen.add(t);
+    return t;
+  };
+  const grab = (sel) => {
+    const out = [];
+    for (const el of document.querySelectorAll(sel)) {
+      if (out.length >= args.max) break;
+      const t = take(el);
+      if (t) out.push(t);
+    }
+    return out;
+  };
+  const headRx = new RegExp(args.head, 'i');
+  const out = {ol: grab('ol li'), ul: grab('ul li'), headings: [], paragraphs: [], main: ''};
+  for (const h of document.querySelectorAll('h2, h3, h4')) {
+    const text = (h.innerText || '').trim();
+    if (!headRx.test(text)) continue;
+    const siblings = [];
+    for (let sib = h.nextElementSibling; sib && siblings.length < args.max; sib = sib.nextElementSibling) {
+      if (/^H[1-4]$/.test(sib.tagName)) break;
+      const items = sib.matches('p, li') ? [sib] : Array.from(sib.querySelectorAll('p, li'));
+      for (const el of items) {
+        const t = take(el);
+        if (t) siblings.push(t);
+      }
+    }
+    if (siblings.length) out.headings.push({text, siblings});
+  }
+  out.paragraphs = grab('p, li, div');
+  for (const sel of args.contentSelectors) {
+    const el = document.querySelector(sel);
+    const t = el ? (el.innerText || '') : '';
+    if (t.trim().length > 50) { out.main = t; break; }
+  }
+  if (!out.main && document.body) out.main = document.body.innerText || '';
+  return out;
+}
+"""
+
+_STEP_LINE_RX = re.compile(r"^(?:(?:Krok|Etap|Step)\s*\d+[\:\-\.\) ]|\d+[\.\)])\s*", re.IGNORECASE)
+_BULLET_RX = re.compile(r"^[\-•—]\s+")
+_STEP_HEADING_RX = re.compile(r"proces|etap|krok|test|wdrażanie|publikacja", re.IGNORECASE)
+_STEP_ANCHOR_RX = _words_rx((
+    "proces projektowania", "krok", "etap", "step", "jak wygląda proces",
+    "proces testowania", "proces wdrażania", "publikacja"
+))
+STEP_ANCHOR_WINDOW = 30
+STEP_LEN_MIN, STEP_LEN_MAX = 5, 180
+# Kandydat musi mieć prefiks kroku albo słowo akcji (i rozsądną długość); szum dyskwalifikuje
+MIN_STEP_SCORE = 2
+
+def score_step_candidate(low: str, has_prefix: bool, in_step_section: bool) -> int:
+    """2·prefiks kroku + słowo akcji + długość w oknie + sąsiedztwo nagłówka/kotwicy − 3·szum."""
+    score = 2 * has_prefix
+    score += bool(_ACTION_RX.search(low))
+    score += STEP_LEN_MIN <= len(low) <= STEP_LEN_MAX
+    score += in_step_section
+    score -= 3 * line_is_noise(low)
+    return score
+
+def rank_step_candidates(cand: dict, k: int = 3) -> list[str]:
+    """Ocenia wszystkich kandydatów z ARTICLE_STEPS_JS jednym przebiegiem i zwraca k najlepszych
+    w kolejności występowania. Przy równej ocenie wygrywa kolejność: ol, ul, nagłówki, akapity,
+    tekst główny. Sam słowny "krok" (bez prefiksu i spoza <ol>) liczy się tylko z <ul>
+    i z sekcji kroków — zwykłe zdania z artykułu nie są krokami."""
+    raw: list[tuple[str, bool, bool, bool]] = []  # (tekst, z <ol>, z <ul>, w sekcji kroków)
+    raw += [(t, True, False, False) for t in cand.get("ol", [])]
+    raw += [(t, False, True, False) for t in cand.get("ul", [])]
+    for hd in cand.get("headings", []):
+        raw += [(t, False, False, True) for t in hd.get("siblings", [])]
+    raw += [(t, False, False, False) for t in cand.get("paragraphs", [])]
+    lines = [l.strip() for l in (cand.get("main") or "").splitlines() if l.strip()]
+    anchor = next((i for i, l in enumerate(lines) if _STEP_ANCHOR_RX.search(l.lower())), None)
+    for i, l in enumerate(lines):
+        raw.append((l, False, False, anchor is not None and anchor < i <= anchor + STEP_ANCHOR_WINDOW))
+
+    best: dict[str, tuple[int, int, str]] = {}
+    for order, (text, from_ol, from_ul, in_section) in enumerate(raw):
+        m = _STEP_LINE_RX.match(text) or _BULLET_RX.match(text)
+        if not (from_ol or m or from_ul or in_section):
+            continue
+        step = text[m.end():].strip() if m else text
+        low = step.lower()
+        score = score_step_candidate(low, from_ol or bool(m), in_section)
+        if score < MIN_STEP_SCORE:
+            continue
+        prev = best.get(low)
+        if prev is None or score > prev[0]:
+            best[low] = (score, prev[1] if prev else order, step)
+    top = sorted(best.values(), key=lambda c: (-c[0], c[1]))[:k]
+    return [step for _, _, step in sorted(top, key=lambda c: c[1])]
+
+async def extract_three_steps_from_article(pool: PagePool, article_url: str) -> list[str]:
+    async with pool.acquire() as art_page:
+        if not await safe_goto(art_page, article_url):
+            return []
+        await dismiss_cookies_any(art_page)
+        await art_page.wait_for_timeout(800)
         try:
-            art_page.close()
+            cand = await art_page.evaluate(ARTICLE_STEPS_JS, {
+                "max": 200,
+                "minLen": STEP_LEN_MIN,
+                "maxLen": 240,
+                "head": _STEP_HEADING_RX.pattern,
+                "contentSelectors": CONTENT_SELECTORS,
+            })
         except Exception:
-            pass
+            cand = {}
+        return rank_step_candidates(cand or {}, k=3)
 
 # ===== FALLBACK: szablony kroków =====
-def resolve_three_steps_fallback(question: str) -> list[str]:
-    ql = (question or "").lower()
-    if any(kw in ql for kw in [
+# (frazy w pytaniu -> gotowe 3 kroki); frazy skompilowane do jednej alternacji na szablon
+_STEP_TEMPLATES = [
+    (_words_rx([
         "proces projektowania aplikacji", "proces projektowania oprogramowania", "jak wygląda proces projektowania",
         "software design process", "pierwsze trzy kroki projektowania aplikacji"
-    ]):
-        return [
-            "Analiza wymagań (cele biznesowe, użytkownicy, zakres)",
-            "Projekt rozwiązania/architektury (technologie, moduły, integracje)",
-            "Makiety lub prototyp UX (przepływy, walidacja z interesariuszami)"
-        ]
-    if any(kw in ql for kw in [
+    ]), [
+        "Analiza wymagań (cele biznesowe, użytkownicy, zakres)",
+        "Projekt rozwiązania/architektury (technologie, moduły, integracje)",
+        "Makiety lub prototyp UX (przepływy, walidacja z interesariuszami)"
+    ]),
+    (_words_rx([
         "proces testowania", "jak wygląda proces testowania", "testowanie aplikacji",
         "pierwsze trzy kroki testowania", "software testing process"
-    ]):
-        return [
-            "Plan testów i przygotowanie przypadków (zakres, kryteria wejścia/wyjścia)",
-            "Testy jednostkowe i integracyjne w CI (uruchomienia automatyczne)",
-            "Testy systemowe/UAT i raportowanie błędów (triage, priorytety)"
-        ]
-    if any(kw in ql for kw in [
+    ]), [
+        "Plan testów i przygotowanie przypadków (zakres, kryteria wejścia/wyjścia)",
+        "Testy jednostkowe i integracyjne w CI (uruchomienia automatyczne)",
+        "Testy systemowe/UAT i raportowanie błędów (triage, priorytety)"
+    ]),
+    (_words_rx([
         "proces wdrażania", "wdrożenie", "deployment", "release process", "pierwsze kroki wdrażania"
-    ]):
-        return [
-            "Przygotowanie środowisk i pipeline CI/CD (dev/stage/prod)",
-            "Konfiguracja aplikacji, migracje bazy i zarządzanie sekretami",
-            "Rollout i monitoring (canary/blue-green), plan rollbacku"
-        ]
-    if any(kw in ql for kw in [
+    ]), [
+        "Przygotowanie środowisk i pipeline CI/CD (dev/stage/prod)",
+        "Konfiguracja aplikacji, migracje bazy i zarządzanie sekretami",
+        "Rollout i monitoring (canary/blue-green), plan rollbacku"
+    ]),
+    (_words_rx([
         "publikacja w sklepach", "google play", "app store", "jak opublikować aplikację",
         "release w sklepach", "dystrybucja mobilna"
-    ]):
-        return [
-            "Zbudowanie i podpisanie pakietów (Android .aab/.apk, iOS .ipa)",
-            "Przygotowanie listingów (opis, grafiki, polityka prywatności)",
-            "Wysłanie do review/testów beta (TestFlight/closed track) i konfiguracja wersji"
-        ]
+    ]), [
+        "Zbudowanie i podpisanie pakietów (Android .aab/.apk, iOS .ipa)",
+        "Przygotowanie listingów (opis, grafiki, polityka prywatności)",
+        "Wysłanie do review/testów beta (TestFlight/closed track) i konfiguracja wersji"
+    ]),
+]
+
+def resolve_three_steps_fallback(question: str) -> list[str]:
+    q = question or ""
+    for rx, steps in _STEP_TEMPLATES:
+        if rx.search(q):
+            return list(steps)
     return []
 
 # ===== CAPTCHA =====
-def detect_captcha(page) -> str:
+CAPTCHA_SELECTORS = {
+    "recaptcha": "iframe[title*='reCAPTCHA'], .grecaptcha-badge",
+    "hcaptcha": "iframe[src*='hcaptcha.com'], [data-hcaptcha]",
+}
+
+CAPTCHA_JS = """
+(sel) => ({
+  recaptcha: !!document.querySelector(sel.recaptcha),
+  hcaptcha: !!document.querySelector(sel.hcaptcha),
+})
+"""
+
+def _captcha_kind(result: dict) -> str:
+    if result.get("recaptcha"):
+        return "recaptcha"
+    if result.get("hcaptcha"):
+        return "hcaptcha"
+    return "none"
+
+async def detect_captcha(page) -> str:
     try:
-        if page.locator("iframe[title*='reCAPTCHA']").count() > 0 or page.locator(".grecaptcha-badge").count() > 0:
-            return "recaptcha"
+        return _captcha_kind(await page.evaluate(CAPTCHA_JS, CAPTCHA_SELECTORS))
     except Exception:
-        pass
+        return "none"
+
+# Jedno evaluate po wejściu na konkurs: tekst strony (pytanie, wygaśnięcie),
+# obecność formularza i CAPTCHA — zamiast inner_text + locator("form").count() + osobnej sondy.
+PROBE_JS = """
+(sel) => ({
+  text: document.body ? document.body.innerText : '',
+  hasForm: !!document.querySelector('form'),
+  recaptcha: !!document.querySelector(sel.recaptcha),
+  hcaptcha: !!document.querySelector(sel.hcaptcha),
+})
+"""
+
+async def probe_page(scope) -> dict:
+    """{'text': str, 'has_form': bool, 'captcha': 'recaptcha'|'hcaptcha'|'none'} w jednym IPC."""
     try:
-        if page.locator("iframe[src*='hcaptcha.com']").count() > 0 or page.locator("[data-hcaptcha]").count() > 0:
-            return "hcaptcha"
+        res = await scope.evaluate(PROBE_JS, CAPTCHA_SELECTORS)
+        return {"text": res.get("text") or "", "has_form": bool(res.get("hasForm")),
+                "captcha": _captcha_kind(res)}
     except Exception:
-        pass
-    return "none"
+        # jak dawniej: błąd sondy formularza nie oznacza wygaśnięcia
+        return {"text": await get_text(scope), "has_form": True, "captcha": "none"}
 
-def wait_for_captcha_solved(page, timeout_ms: int = 60000) -> bool:
-    cap = detect_captcha(page)
+async def wait_for_captcha_solved(page, timeout_ms: int = 60000, cap: str | None = None) -> bool:
+    if cap is None:
+        cap = await detect_captcha(page)
     if cap == "none":
         return True
     print(f"[CAPTCHA] Wykryto: {cap}. Czekam do {timeout_ms} ms na rozwiązanie...")
     try:
-        page.wait_for_selector("input[name*='h-captcha-response'], input[name*='g-recaptcha-response']", timeout=timeout_ms)
+        await page.wait_for_selector("input[name*='h-captcha-response'], input[name*='g-recaptcha-response']", timeout=timeout_ms)
         return True
     except PlaywrightTimeout:
         print("[CAPTCHA] Timeout oczekiwania.")
@@ -743,17 +1335,17 @@ def wait_for_captcha_solved(page, timeout_ms: int = 60000) -> bool:
         return False
 
 # ===== Artefakty =====
-def dump_artifacts(page, scope, prefix: str):
+async def dump_artifacts(page, scope, prefix: str):
     try:
         png = f"{prefix}.png"
         html_page = f"{prefix}.page.html"
         html_frame = f"{prefix}.frame.html"
-        page.screenshot(path=png, full_page=True)
+        await page.screenshot(path=png, full_page=True)
         with open(html_page, "w", encoding="utf-8") as f:
-            f.write(page.content())
+            f.write(await page.content())
         if scope is not None:
             try:
-                body_html = scope.locator("body").evaluate("el => el.outerHTML")
+                body_html = await scope.locator("body").evaluate("el => el.outerHTML")
             except Exception:
                 body_html = ""
             with open(html_frame, "w", encoding="utf-8") as f:
@@ -763,119 +1355,277 @@ def dump_artifacts(page, scope, prefix: str):
         print(f"[ART] Błąd zapisu artefaktów: {e}")
 
 # ===== Skan pól i wypełnianie (mapping) =====
-def scan_fields(scope):
-    js = """
-    () => {
-      const out = {imie:null, nazwisko:null, email:null, miasto:null, odp:null, all:[]};
-      const inputs = Array.from(document.querySelectorAll('input, textarea, [contenteditable="true"]'));
-      const labelsByFor = new Map();
-      Array.from(document.querySelectorAll('label[for]')).forEach(l=>labelsByFor.set(l.getAttribute('for'), (l.textContent||'').trim().toLowerCase()));
-      function isVisible(el){
-        const s = window.getComputedStyle(el);
-        if (s.visibility==='hidden' || s.display==='none') return false;
-        const r = el.getBoundingClientRect();
-        return r && r.width>2 && r.height>2;
-      }
-      function labelText(el){
-        let txt = '';
-        if (el.labels && el.labels.length){ txt = Array.from(el.labels).map(l=>l.textContent.trim().toLowerCase()).join(' \\n '); }
-        const id = el.getAttribute('id');
-        if (!txt && id && labelsByFor.has(id)) txt = labelsByFor.get(id);
-        const prev = el.previousElementSibling;
-        if (!txt && prev && prev.tagName.toLowerCase()==='label') txt = (prev.textContent||'').trim().toLowerCase();
-        return txt;
-      }
-      const kw = {
-        imie: ['imię','imie','first name','firstname'],
-        nazwisko: ['nazwisko','last name','lastname'],
-        email: ['email','e-mail','adress e-mail','adres e-mail','mail'],
-        miasto: ['miasto','city'],
-        odp: ['twoja odpowiedź','odpowiedź','answer','treść odpowiedzi']
-      };
-      function anyMatch(text, arr){ return !!text && arr.some(k=>text.indexOf(k) !== -1); }
-      function buildSelector(el){
-        const id = el.getAttribute('id');
-        const name = el.getAttribute('name');
-        if (id) return '#' + id;
-        if (name) return el.tagName.toLowerCase() + '[name="' + name.split('"').join('\\\"') + '" ]';
-        const parent = el.parentElement;
-        if (parent){
-          const siblings = Array.from(parent.querySelectorAll(el.tagName));
-          const idx = siblings.indexOf(el)+1;
-          return el.tagName.toLowerCase() + ':nth-of-type(' + (idx>0?idx:1) + ')';
-        }
-        return el.tagName.toLowerCase();
-      }
-      for (const el of inputs){
-        if (!isVisible(el)) continue;
-        if (el.matches('input[type="hidden"], input[disabled], textarea[disabled], input[readonly], textarea[readonly]')) continue;
-        const tag = el.tagName.toLowerCase();
-        const type = (el.getAttribute('type')||'').toLowerCase();
-        const name = (el.getAttribute('name')||'').toLowerCase();
-        const id = (el.getAttribute('id')||'').toLowerCase();
-        const ph = (el.getAttribute('placeholder')||'').toLowerCase();
-        const aria = (el.getAttribute('aria-label')||'').toLowerCase();
-        const lab = labelText(el);
-        const sel = buildSelector(el);
-        out.all.push({sel, tag, type, name, id, ph, aria, lab});
-        if (!out.email && type==='email') out.email = sel;
-        if (!out.odp && (tag==='textarea' || el.getAttribute('contenteditable')==='true')) out.odp = sel;
-        if (!out.imie && (anyMatch(name, kw.imie) || anyMatch(id, kw.imie) || anyMatch(ph, kw.imie) || anyMatch(aria, kw.imie) || anyMatch(lab, kw.imie))) out.imie = sel;
-        if (!out.nazwisko && (anyMatch(name, kw.nazwisko) || anyMatch(id, kw.nazwisko) || anyMatch(ph, kw.nazwisko) || anyMatch(aria, kw.nazwisko) || anyMatch(lab, kw.nazwisko))) out.nazwisko = sel;
-        if (!out.miasto && (anyMatch(name, kw.miasto) || anyMatch(id, kw.miasto) || anyMatch(ph, kw.miasto) || anyMatch(aria, kw.miasto) || anyMatch(lab, kw.miasto))) out.miasto = sel;
-        if (!out.email && (anyMatch(name, kw.email) || anyMatch(id, kw.email) || anyMatch(ph, kw.email) || anyMatch(aria, kw.email) || anyMatch(lab, kw.email))) out.email = sel;
-        if (!out.odp && (anyMatch(name, kw.odp) || anyMatch(id, kw.odp) || anyMatch(ph, kw.odp) || anyMatch(aria, kw.odp) || anyMatch(lab, kw.odp))) out.odp = sel;
+# Jeden evaluate i jeden querySelectorAll na formularz: pola, checkboxy RODO i kandydat
+# na przycisk wysyłki. Pola wracają jako równoległe tablice (sel[i], tag[i], type[i],
+# hay[i], ...); klasyfikacja odbywa się po stronie Pythona.
+# hay = name/id/placeholder/aria-label/etykieta złączone '\n' (bez zmiany wielkości liter — regexy mają flagę i).
+# Pola, których klasyfikacja i tak by nie wybrała, są pomijane przed buildSelector.
+INSPECT_FORM_JS = """
+(anyKw) => {
+  const kwRe = new RegExp(anyKw, 'i');
+  const cols = {sel:[], tag:[], type:[], hay:[], editable:[]};
+  const checkboxes = [];
+  let submit = null, submitRank = 99;
+  // checkboxy i przycisk oznaczane atrybutem — stabilny selektor bez nth-of-type
+  document.querySelectorAll('[data-pm]').forEach(e=>e.removeAttribute('data-pm'));
+  const inputs = document.querySelectorAll('input, textarea, button, [contenteditable="true"]');
+  const labelsByFor = new Map();
+  Array.from(document.querySelectorAll('label[for]')).forEach(l=>labelsByFor.set(l.getAttribute('for'), (l.textContent||'').trim()));
+  function isVisible(el){
+    const s = window.getComputedStyle(el);
+    if (s.visibility==='hidden' || s.display==='none') return false;
+    const r = el.getBoundingClientRect();
+    return r && r.width>2 && r.height>2;
+  }
+  function labelText(el){
+    let txt = '';
+    if (el.labels && el.labels.length){ txt = Array.from(el.labels).map(l=>l.textContent.trim()).join(' \\n '); }
+    const id = el.getAttribute('id');
+    if (!txt && id && labelsByFor.has(id)) txt = labelsByFor.get(id);
+    const prev = el.previousElementSibling;
+    if (!txt && prev && prev.tagName.toLowerCase()==='label') txt = (prev.textContent||'').trim();
+    return txt;
+  }
+  function buildSelector(el){
+    const id = el.getAttribute('id');
+    const name = el.getAttribute('name');
+    if (id) return '#' + id;
+    if (name) return el.tagName.toLowerCase() + '[name="' + name.split('"').join('\\\"') + '" ]';
+    const parent = el.parentElement;
+    if (parent){
+      const siblings = Array.from(parent.querySelectorAll(el.tagName));
+      const idx = siblings.indexOf(el)+1;
+      return el.tagName.toLowerCase() + ':nth-of-type(' + (idx>0?idx:1) + ')';
+    }
+    return el.tagName.toLowerCase();
+  }
+  function isShown(el){
+    const r = el.getBoundingClientRect();
+    return r.width>0 && r.height>0 && window.getComputedStyle(el).visibility!=='hidden';
+  }
+  // ranga jak w kaskadzie click_submit: "Wyślij…" > button[submit] > input[submit] > "Zgłoś" > klasy
+  function submitRankOf(el, tag, type){
+    const txt = ((tag==='input' ? el.value : el.innerText) || '') + ' ' + (el.getAttribute('aria-label')||'');
+    if (/wyślij/i.test(txt)) return 0;
+    if (tag==='button' && type==='submit') return 1;
+    if (tag==='input' && type==='submit') return 2;
+    if (tag==='button' && /zgłoś/i.test(txt)) return 3;
+    if (el.matches('.submit, .btn-submit, .btn-primary[type="submit"]')) return 4;
+    return 99;
+  }
+  let textInputs = 0;
+  for (const el of inputs){
+    const tag = el.tagName.toLowerCase();
+    const type = (el.getAttribute('type')||'').toLowerCase();
+    if (type==='checkbox'){
+      if (!el.checked && !el.disabled && el.closest('form') && isShown(el)){
+        el.setAttribute('data-pm', 'cb' + checkboxes.length);
+        checkboxes.push('[data-pm="cb' + checkboxes.length + '"]');
       }
-      const textInputs = out.all.filter(r=>r.tag==='input' && (r.type==='text' || r.type===''));
-      if (!out.imie && textInputs.length>0) out.imie = textInputs[0].sel;
-      if (!out.nazwisko && textInputs.length>1) out.nazwisko = textInputs[1].sel;
-      if (!out.email){ const mail = out.all.find(r=>r.type==='email'); if (mail) out.email = mail.sel; }
-      if (!out.odp){ const ta = out.all.find(r=>r.tag==='textarea'); if (ta) out.odp = ta.sel; }
-      return out;
     }
-    """
+    if (tag==='button' || type==='submit'){
+      const rank = submitRankOf(el, tag, type);
+      if (rank < submitRank && !el.disabled && isShown(el)){ submit = el; submitRank = rank; }
+      if (tag==='button') continue;
+    }
+    if (el.matches('input[type="hidden"], input[disabled], textarea[disabled], input[readonly], textarea[readonly]')) continue;
+    const editable = el.getAttribute('contenteditable')==='true';
+    const hay = [el.getAttribute('name'), el.getAttribute('id'), el.getAttribute('placeholder'),
+                 el.getAttribute('aria-label'), labelText(el)].filter(Boolean).join('\\n');
+    const isText = tag==='input' && (type==='text' || type==='');
+    let wanted = type==='email' || tag==='textarea' || editable || kwRe.test(hay);
+    if (!wanted && !isText) continue;
+    if (!isVisible(el)) continue;
+    // dwa pierwsze widoczne pola tekstowe to fallback na imię/nazwisko
+    if (isText){ wanted = wanted || textInputs < 2; textInputs++; }
+    if (!wanted) continue;
+    cols.sel.push(buildSelector(el));
+    cols.tag.push(tag);
+    cols.type.push(type);
+    cols.hay.push(hay);
+    cols.editable.push(editable);
+  }
+  if (submit) submit.setAttribute('data-pm', 'submit');
+  return {fields: cols, checkboxes, submit: submit ? '[data-pm="submit"]' : null};
+}
+"""
+
+# Jedna alternacja na slot (składnia wspólna dla Pythona i RegExp w JS; wielkość liter: flaga I/i)
+FIELD_PATTERNS = {
+    "imie": r"imi[eę]|first ?name",
+    "nazwisko": r"nazwisko|last ?name",
+    "email": r"e-?mail|mail",
+    "miasto": r"miasto|city",
+    "odp": r"odpowied[zź]|answer",
+}
+_FIELD_RX = {slot: re.compile(p, re.IGNORECASE) for slot, p in FIELD_PATTERNS.items()}
+# Suma wszystkich slotów — wstępny filtr po stronie JS
+_FIELD_ANY_RX = re.compile("|".join(f"(?:{p})" for p in FIELD_PATTERNS.values()), re.IGNORECASE)
+# Kolejność jak w dotychczasowym dopasowaniu: pierwsze pasujące pole wygrywa
+_FIELD_ORDER = ("imie", "nazwisko", "miasto", "email", "odp")
+
+def classify_fields(cols: dict) -> dict:
+    """Przypisuje selektory pól (imie/nazwisko/email/miasto/odp) na podstawie kolumn z INSPECT_FORM_JS."""
+    out: dict[str, str | None] = {slot: None for slot in FIELD_PATTERNS}
+    sels, tags, types = cols.get("sel", []), cols.get("tag", []), cols.get("type", [])
+    hays, editable = cols.get("hay", []), cols.get("editable", [])
+    for i, sel in enumerate(sels):
+        if not out["email"] and types[i] == "email":
+            out["email"] = sel
+        if not out["odp"] and (tags[i] == "textarea" or editable[i]):
+            out["odp"] = sel
+        if hays[i]:
+            for slot in _FIELD_ORDER:
+                if not out[slot] and _FIELD_RX[slot].search(hays[i]):
+                    out[slot] = sel
+        if all(out.values()):
+            return out
+    text_inputs = [sels[i] for i in range(len(sels)) if tags[i] == "input" and types[i] in ("text", "")]
+    if not out["imie"] and text_inputs:
+        out["imie"] = text_inputs[0]
+    if not out["nazwisko"] and len(text_inputs) > 1:
+        out["nazwisko"] = text_inputs[1]
+    if not out["odp"]:
+        out["odp"] = next((sels[i] for i in range(len(sels)) if tags[i] == "textarea"), None)
+    return out
+
+async def inspect_form(scope) -> dict | None:
+    """Jednym evaluate zwraca {'fields': mapping, 'checkboxes': [sel…], 'submit': sel | None}."""
     try:
-        return scope.evaluate(js)
+        res = await scope.evaluate(INSPECT_FORM_JS, _FIELD_ANY_RX.pattern)
     except Exception as e:
-        print('[ERR] scan_fields evaluate failed:', e)
+        print('[ERR] inspect_form evaluate failed:', e)
         return None
+    res = res or {}
+    return {"fields": classify_fields(res.get("fields") or {}),
+            "checkboxes": res.get("checkboxes") or [],
+            "submit": res.get("submit")}
+
+# ===== CACHE MAPOWANIA PÓL =====
+# {contest_url: {"fields": {imie: sel, ...}, "ts": int}} — przy ponownej wizycie (retry po
+# NOT_SENT/ERROR, dry-run) pomija klasyfikację pól. Pytanie zawsze czytane ze strony (może się zmienić).
+FIELDS_CACHE_FILE = "fields_cache.json"
+FIELDS_CACHE_TTL = 7 * 24 * 3600
+_FIELDS_CACHE: dict[str, dict] | None = None
+
+def _fields_cache() -> dict[str, dict]:
+    global _FIELDS_CACHE
+    if _FIELDS_CACHE is None:
+        _FIELDS_CACHE = {}
+        if os.path.exists(FIELDS_CACHE_FILE):
+            try:
+                with open(FIELDS_CACHE_FILE, "r", encoding="utf-8") as f:
+                    _FIELDS_CACHE = json.load(f)
+            except Exception as e:
+                print(f"[CACHE] Błąd odczytu {FIELDS_CACHE_FILE}: {e} — zaczynam od pustego")
+    return _FIELDS_CACHE
 
-def pw_fill_or_js(scope, selector: str, value: str) -> bool:
-    """Wypełnia pole z losowym opóźnieniem między znakami (human-like)."""
+def _save_fields_cache():
+    tmp = FIELDS_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_fields_cache(), f, ensure_ascii=False)
+        os.replace(tmp, FIELDS_CACHE_FILE)
+    except Exception as e:
+        print(f"[CACHE] Błąd zapisu {FIELDS_CACHE_FILE}: {e}")
+
+async def cached_form(scope, contest_url: str) -> dict | None:
+    """Wpis z cache (młodszy niż FIELDS_CACHE_TTL), o ile jego selektor nadal istnieje na stronie."""
+    entry = _fields_cache().get(contest_url)
+    if not entry or time.time() - entry.get("ts", 0) > FIELDS_CACHE_TTL:
+        return None
+    fields = entry.get("fields") or {}
+    probe = fields.get("odp") or next((v for v in fields.values() if v), None)
+    try:
+        if probe and await scope.locator(probe).count() > 0:
+            return entry
+    except Exception:
+        pass
+    return None
+
+def remember_form(contest_url: str, fields: dict):
+    _fields_cache()[contest_url] = {"fields": fields, "ts": int(time.time())}
+    _save_fields_cache()
+
+def forget_form(contest_url: str):
+    if _fields_cache().pop(contest_url, None) is not None:
+        _save_fields_cache()
+
+async def pw_fill_or_js(scope, selector: str, value: str, slow_typing: bool = False) -> bool:
+    """Wypełnia pole przez fill(); slow_typing=True wpisuje znak po znaku (human-like)."""
     try:
         loc = scope.locator(selector)
-        if loc.count() > 0 and loc.first.is_visible():
+        if await loc.count() > 0 and await loc.first.is_visible():
             try:
-                loc.first.click(timeout=1500)
-                loc.first.wait_for_element_state("stable", timeout=500)
+                await loc.first.click(timeout=1500)
+                await loc.first.wait_for_element_state("stable", timeout=500)
             except Exception:
                 pass
             try:
-                # Wyczyść pole i wpisz znak po znaku
-                loc.first.fill("")
-                loc.first.type(value, delay=random.randint(30, 120))
-                loc.first.press('Tab')
+                if slow_typing:
+                    # Wyczyść pole i wpisz znak po znaku
+                    await loc.first.fill("")
+                    await loc.first.type(value, delay=random.randint(30, 120))
+                else:
+                    # fill() sam wysyła 'input'; 'change' dla formularzy nasłuchujących tylko na nie
+                    await loc.first.fill(value)
+                    await loc.first.dispatch_event("change")
+                await loc.first.press('Tab')
                 return True
             except Exception:
                 pass
     except Exception:
         pass
     try:
-        return bool(scope.evaluate("(sel,val)=>{const el=document.querySelector(sel); if(!el) return false; try{el.focus(); const tag=el.tagName.toLowerCase(); if(tag==='textarea' || tag==='input'){el.value=val; el.dispatchEvent(new Event('input',{bubbles:true})); el.dispatchEvent(new Event('change',{bubbles:true})); el.blur(); return true;} if(el.getAttribute('contenteditable')==='true'){el.textContent=val; el.dispatchEvent(new Event('input',{bubbles:true})); el.dispatchEvent(new Event('change',{bubbles:true})); el.blur(); return true;} }catch(e){return false} return false;}", selector, value))
+        return bool(await scope.evaluate("(sel,val)=>{const el=document.querySelector(sel); if(!el) return false; try{el.focus(); const tag=el.tagName.toLowerCase(); if(tag==='textarea' || tag==='input'){el.value=val; el.dispatchEvent(new Event('input',{bubbles:true})); el.dispatchEvent(new Event('change',{bubbles:true})); el.blur(); return true;} if(el.getAttribute('contenteditable')==='true'){el.textContent=val; el.dispatchEvent(new Event('input',{bubbles:true})); el.dispatchEvent(new Event('change',{bubbles:true})); el.blur(); return true;} }catch(e){return false} return false;}", selector, value))
     except Exception:
         return False
 
 # ===== RODO checkboxy =====
-def check_rodo_checkboxes(scope) -> int:
-    """Zaznacza wszystkie niezaznaczone checkboxy w formularzu (zgody RODO)."""
+# sels — selektory z inspect_form; null = wszystkie checkboxy w formularzach.
+# stuck = kliknięte, ale nadal niezaznaczone (strona odrzuca syntetyczne kliknięcia).
+RODO_JS = """
+(sels) => {
+  let cbs = sels && sels.length ? document.querySelectorAll(sels.join(', ')) : [];
+  // zgody dorysowane po wpisaniu danych albo przerysowany formularz (bez data-pm) — skan formularza
+  const scanned = !cbs.length;
+  if (scanned) cbs = document.querySelectorAll("form input[type='checkbox']");
+  let clicked = 0, stuck = 0;
+  for (const c of cbs) {
+    if (c.checked || c.disabled || c.offsetParent === null) continue;
+    c.click();
+    if (c.checked) clicked++; else stuck++;
+  }
+  return {clicked, stuck, scanned};
+}
+"""
+
+async def check_rodo_checkboxes(scope, selectors: list[str] | None = None) -> int:
+    """Zaznacza wszystkie niezaznaczone checkboxy w formularzu (zgody RODO).
+    selectors — wynik inspect_form; bez nich (lub gdy żaden już nie pasuje) skanuje formularz.
+    Najpierw jedno evaluate; przez Playwright tylko gdy kliknięcia w JS nie zadziałały."""
     checked = 0
     try:
-        cbs = scope.locator("form input[type='checkbox']")
-        for i in range(cbs.count()):
+        res = await scope.evaluate(RODO_JS, selectors)
+        checked = res.get("clicked", 0)
+        if not res.get("stuck"):
+            return checked
+        if res.get("scanned"):
+            selectors = None
+    except Exception:
+        pass
+    try:
+        if not selectors or not await scope.locator(", ".join(selectors)).count():
+            selectors = None
+        if selectors is not None:
+            cbs = [scope.locator(sel) for sel in selectors]
+        else:
+            loc = scope.locator("form input[type='checkbox']")
+            cbs = [loc.nth(i) for i in range(await loc.count())]
+        for cb in cbs:
             try:
-                cb = cbs.nth(i)
-                if cb.is_visible() and not cb.is_checked():
-                    cb.check(timeout=1000)
+                if await cb.is_visible() and not await cb.is_checked():
+                    await cb.check(timeout=1000)
                     checked += 1
             except Exception:
                 pass
@@ -884,30 +1634,38 @@ def check_rodo_checkboxes(scope) -> int:
     return checked
 
 # ===== SUBMIT =====
-def click_submit(scope) -> bool:
-    texts = ["Wyślij", "Wyślij zgłoszenie", "Wyślij formularz", "Wyślij odpowiedź", "Wyślij wiadomość"]
-    for t in texts:
+# Kolejność = priorytet: przycisk z nazwą "Wyślij…" (rola), potem ogólne selektory submit
+_SUBMIT_NAME_RX = re.compile("wyślij", re.IGNORECASE)
+SUBMIT_SELECTORS = [
+    "button[type='submit']",
+    "input[type='submit']",
+    "button:has-text('ZGŁOŚ')",
+    ".submit", ".btn-submit", ".btn-primary[type='submit']",
+]
+
+async def click_submit(scope, submit_sel: str | None = None) -> bool:
+    """Klika przycisk wysyłki; submit_sel (z inspect_form) próbowany jako pierwszy.
+    Potem jedno wspólne oczekiwanie (3 s) na dowolnego kandydata zamiast timeoutu na każdy."""
+    if submit_sel:
         try:
-            scope.get_by_role("button", name=re.compile(t, re.IGNORECASE)).click(timeout=2000)
+            await scope.locator(submit_sel).click(timeout=2000)
             return True
         except Exception:
             pass
-    for sel in [
-        "button[type='submit']",
-        "input[type='submit']",
-        "button:has-text('Wyślij')",
-        "button:has-text('ZGŁOŚ')",
-        ".submit, .btn-submit, .btn-primary[type='submit']",
-    ]:
-        try:
-            loc = scope.locator(sel)
-            if loc.count() > 0 and loc.first.is_visible():
-                loc.first.click(timeout=2000)
+    by_name = scope.get_by_role("button", name=_SUBMIT_NAME_RX)
+    candidates = [by_name] + [scope.locator(f"{sel}:visible") for sel in SUBMIT_SELECTORS]
+    try:
+        union = by_name.or_(scope.locator(", ".join(f"{sel}:visible" for sel in SUBMIT_SELECTORS)))
+        await union.first.wait_for(state="visible", timeout=3000)
+        # coś już jest — wybór wg priorytetu bez czekania
+        for loc in candidates:
+            if await loc.count() > 0:
+                await loc.first.click(timeout=2000)
                 return True
-        except Exception:
-            pass
+    except Exception:
+        pass
     try:
-        ok = scope.evaluate(
+        ok = await scope.evaluate(
             """
             () => {
               const btns = Array.from(document.querySelectorAll('button,input[type=submit]'))
@@ -924,259 +1682,321 @@ def click_submit(scope) -> bool:
         return False
 
 # ===== MAIN =====
-def run(max_contests: int = 5, max_pages: int = 3, headless: bool = False,
-        interactive: bool = False, captcha_mode: str = "wait", save_artifacts: bool = False,
-        max_daily: int = 3, dry_run: bool = False):
+async def _shutdown(pool: PagePool, context, browser):
+    """Zamyka kolejno: strony z puli, kontekst, przeglądarkę."""
+    await pool.close()
+    try:
+        await context.close()
+    except Exception:
+        pass
+    await browser.close()
+
+async def process_contest(page, pool: PagePool, contest_url: str, article_url: str | None, *,
+                          interactive: bool = False, captcha_mode: str = "wait",
+                          save_artifacts: bool = False, dry_run: bool = False,
+                          slow_typing: bool = False):
+    """Pełna obsługa jednego konkursu na podanej stronie; wynik trafia do logu."""
+    status = "INIT"
+    q = ""
+    a = "??"
+    fill_stats = ""
+    extraction = ""
+    llm_ctx = ""
+    try:
+        print(f"\n>>> Konkurs: {contest_url}")
+        # pełny DOM — częściowy (bez <form>) wyglądałby na wygasły konkurs
+        if not await safe_goto(page, contest_url, timeout=15000, wait_until="domcontentloaded",
+                               ready_selector="form", ready_timeout=2000):
+            status = "ERROR:NavigationFailed"
+            return
+        await dismiss_cookies_any(page)
+        scope = await find_form_frame(page)
+        # domknij CMP także w ramce
+        await dismiss_cookies_any(scope)
+        # Sprawdź czy konkurs wygasł
+        # tekst strony pobierany raz na wizytę — wygaśnięcie i pytanie liczone z niego
+        probe = await probe_page(scope)
+        page_text = probe["text"]
+        today = datetime.now(_TZ).date()
+        if is_contest_expired(page_text, probe["has_form"], today):
+            print("[EXPIRED] Konkurs wygasły — pomijam.")
+            status = "SKIPPED_EXPIRED"
+            log_row(contest_url, article_url, "", "", status, "")
+            return
+        # Symuluj zachowanie człowieka
+        await simulate_human_behavior(page)
+        cached = await cached_form(scope, contest_url)
+        if cached:
+            print("[CACHE] Pola z fields_cache.json")
+        q = get_question_from_text(page_text) or ""
+        print(f"[Pytanie] {q}")
+        # --- Rozwiązywanie odpowiedzi ---
+        y = resolve_year(q)
+        if y is not None:
+            a = str(compute_years_ago(y))
+            print(f"[Odpowiedz] Rok {y} -> {a} lat temu")
+            extraction = "YEARS"
+        else:
+            # Próba ekstrakcji kroków z artykułu
+            steps = []
+            if article_url and _RE_PREV_PAGE.search(q):
+                print(f"[DEBUG] ART URL: {article_url}")
+                steps = await extract_three_steps_from_article(pool, article_url)
+                if steps:
+                    extraction = "EXTRACT_STEPS"
+            # Fallback: szablon
+            if not steps:
+                steps = resolve_three_steps_fallback(q)
+                if steps:
+                    extraction = "TEMPLATE_STEPS"
+            if steps:
+                a = "; ".join([f"{i+1}) {s}" for i, s in enumerate(steps)])
+                tag = "[TEMPLATE]" if extraction == "TEMPLATE_STEPS" else ""
+                print(f"[Odpowiedz]{tag} {a}")
+            else:
+                # Fallback: LLM
+                # synchroniczne SDK — w wątku, żeby nie wstrzymywać pozostałych workerów
+                llm_ctx = await get_main_text(page) if q else ""
+                llm_answer = await asyncio.to_thread(ask_llm, q, llm_ctx)
+                if llm_answer:
+                    a = llm_answer
+                    extraction = "LLM"
+                    print(f"[Odpowiedz][LLM] {a[:200]}")
+                elif interactive:
+                    print("[Resolver] Wpisz odpowiedź ręcznie (page.pause).")
+                    await page.pause()
+                    try:
+                        a = await scope.get_by_label("Twoja odpowiedź", exact=False).input_value() or "??"
+                    except Exception:
+                        a = "??"
+                else:
+                    print("[Resolver] Brak automatycznej odpowiedzi — pomijam.")
+                    a = "??"
+                    extraction = "MANUAL"
+        if cached:
+            # selektory checkboxów/przycisku są ważne tylko w jednej wizycie — te szukają same
+            form = {"fields": cached["fields"], "checkboxes": None, "submit": None}
+        else:
+            form = await inspect_form(scope)
+            if form and any(form["fields"].values()):
+                remember_form(contest_url, form["fields"])
+        mapping = form["fields"] if form else None
+        if mapping:
+            print("[DEBUG] mapping:", mapping)
+            ok_imie = bool(mapping.get('imie')) and await pw_fill_or_js(scope, mapping['imie'], IMIE, slow_typing)
+            ok_nazw = bool(mapping.get('nazwisko')) and await pw_fill_or_js(scope, mapping['nazwisko'], NAZWISKO, slow_typing)
+            ok_mail = bool(mapping.get('email')) and await pw_fill_or_js(scope, mapping['email'], EMAIL, slow_typing)
+            ok_city = bool(mapping.get('miasto')) and await pw_fill_or_js(scope, mapping['miasto'], MIASTO, slow_typing)
+            ok_ans = bool(mapping.get('odp')) and await pw_fill_or_js(scope, mapping['odp'], a, slow_typing)
+            fill_stats = str({
+                'imie': bool(ok_imie), 'nazwisko': bool(ok_nazw), 'email': bool(ok_mail), 'miasto': bool(ok_city), 'odp': bool(ok_ans)
+            })
+            print("[DEBUG] fill status:", fill_stats)
+            # jedna krótka pauza na cały formularz zamiast opóźnień na każdy znak
+            await page.wait_for_timeout(random.randint(150, 400))
+            rodo_cnt = await check_rodo_checkboxes(scope, form["checkboxes"])
+            if rodo_cnt:
+                print(f"[RODO] Zaznaczono {rodo_cnt} checkboxów")
+        else:
+            print("[WARN] Brak mappingu pól — formularz może być w nietypowym komponencie.")
+        if dry_run:
+            print("[DRY-RUN] Pomijam kliknięcie 'Wyślij'.")
+            status = "DRY_FILLED"
+        else:
+            # widget wykryty już przy wejściu — bez ponownej sondy; inaczej sprawdź całą stronę teraz
+            cap = probe["captcha"] if probe["captcha"] != "none" else await detect_captcha(page)
+            if cap != "none":
+                print(f"[CAPTCHA] Wykryto: {cap}; tryb: {captcha_mode}")
+                if captcha_mode == "pause":
+                    if interactive:
+                        await page.pause()
+                    else:
+                        print("[CAPTCHA] Tryb pause, ale interactive=false — kontynuuję bez pauzy.")
+                elif captcha_mode == "wait":
+                    solved = await wait_for_captcha_solved(page, timeout_ms=60000, cap=cap)
+                    print(f"[CAPTCHA] solved={solved}")
+                elif captcha_mode == "skip":
+                    print("[CAPTCHA] Pomijam rozwiązywanie (skip).")
+            sent = await click_submit(scope, form["submit"] if form else None)
+            confirmed = sent and await wait_for_submission_confirmation(page, scope)
+            if sent and confirmed:
+                if extraction == "TEMPLATE_STEPS":
+                    status = "SENT_TEMPLATE"
+                elif extraction == "EXTRACT_STEPS":
+                    status = "SENT_EXTRACT"
+                elif extraction == "YEARS":
+                    status = "SENT_YEARS"
+                elif extraction == "LLM":
+                    status = "SENT_LLM"
+                else:
+                    status = "SENT"
+            elif sent and not confirmed:
+                status = "SENT_UNCONFIRMED"
+            else:
+                status = "NOT_SENT"
+        if save_artifacts:
+            art_dir = "artifacts"
+            os.makedirs(art_dir, exist_ok=True)
+            prefix = os.path.join(art_dir, f"run_{datetime.now(_TZ).strftime('%Y%m%d_%H%M%S')}")
+            await dump_artifacts(page, scope, prefix)
+        print(f"[Status] {status}")
+    except Exception as e:
+        status = f"ERROR:{type(e).__name__}:{e}"
+        print(status)
+    finally:
+        if status == "NOT_SENT":
+            forget_form(contest_url)
+            if extraction == "LLM":
+                forget_llm_answer(q, llm_ctx)
+        log_row(contest_url, article_url, q, a, status, fill_stats)
+
+# Ciasteczka (m.in. zgoda CMP) i localStorage z poprzedniego przebiegu — bez baneru cookies
+# i z "ciepłą" sesją od pierwszego konkursu. Zapisywane po pierwszym udanym (wysłanym) konkursie.
+# Wczytywane do każdego kontekstu — workery mają różne UA/viewport, ale celowo jedną sesję uczestnika.
+STORAGE_STATE_FILE = "storage_state.json"
+
+async def new_browser_context(browser) -> tuple:
+    """Nowy kontekst z losowym UA/viewportem i zapisanym storage_state; zwraca (context, kwargs)."""
+    kw = {
+        "user_agent": random.choice(USER_AGENTS),
+        "viewport": random.choice(VIEWPORTS),
+        "locale": "pl-PL",
+        "timezone_id": "Europe/Warsaw",
+    }
+    if os.path.exists(STORAGE_STATE_FILE):
+        try:
+            return await browser.new_context(storage_state=STORAGE_STATE_FILE, **kw), kw
+        except Exception as e:
+            print(f"[STATE] Nie wczytano {STORAGE_STATE_FILE}: {e} — czysty kontekst")
+    return await browser.new_context(**kw), kw
+
+async def _main(max_contests: int = 5, max_pages: int = 3, headless: bool = False,
+                interactive: bool = False, captcha_mode: str = "wait", save_artifacts: bool = False,
+                max_daily: int = 3, dry_run: bool = False, pool_size: int = 5,
+                slow_typing: bool = False, concurrency: int = 3):
     ensure_log()
-    with sync_playwright() as p:
-        ua = random.choice(USER_AGENTS)
-        vp = random.choice(VIEWPORTS)
-        browser = p.chromium.launch(headless=headless)
-        context = browser.new_context(
-            user_agent=ua,
-            viewport=vp,
-            locale="pl-PL",
-            timezone_id="Europe/Warsaw",
-        )
-        page = context.new_page()
-        # Stealth: ukryj webdriver
-        page.add_init_script(STEALTH_JS)
-        print(f"[STEALTH] UA: {ua[:50]}... VP: {vp['width']}x{vp['height']}")
+    _load_state()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context, ctx_kwargs = await new_browser_context(browser)
+        pool = await PagePool.create(context, size=pool_size)
+        print(f"[STEALTH] UA: {ctx_kwargs['user_agent'][:50]}... VP: {ctx_kwargs['viewport']['width']}x{ctx_kwargs['viewport']['height']}")
         # wstępny guard limitu dziennego
         already = count_today_sent()
         if already >= max_daily:
             print(f"[LIMIT] Dzisiejszy limit {max_daily} wysyłek już osiągnięty ({already}). Kończę.")
-            browser.close()
+            await _shutdown(pool, context, browser)
             return
         print("[INFO] Zbieram linki ARTYKULOW...")
-        article_links = collect_article_links(page, max_pages=max_pages)
-        print(f"[INFO] Znaleziono artykulow: {len(article_links)}")
-        print("[INFO] Ekstrahuje pary FORMULARZ<->ARTYKUL...")
-        pairs: list[tuple[str, str | None]] = []
-        for art in article_links:
-            pairs.extend(extract_form_pairs_from_article(page, art))
+        client = new_http_client(ctx_kwargs["user_agent"])
+        try:
+            article_links = await collect_article_links_http(client, max_pages) if client else None
+            if article_links is None:
+                async with pool.acquire() as list_page:
+                    article_links = await collect_article_links(list_page, max_pages=max_pages)
+            print(f"[INFO] Znaleziono artykulow: {len(article_links)}")
+            print("[INFO] Ekstrahuje pary FORMULARZ<->ARTYKUL...")
+            pairs: list[tuple[str, str | None]] = await collect_form_pairs(pool, article_links, limit=max_contests,
+                                                                          client=client)
+        finally:
+            if client is not None:
+                await client.aclose()
         if not pairs:
             pairs = [(u, None) for u in SEED_FORMS]
             print("[WARN] Brak par z listy — używam SEED_FORMS.")
         print(f"[INFO] Pary FORM<->ART: {len(pairs)}")
         # filtruj już wysłane
-        already_sent_urls = get_already_sent_urls()
-        pairs = [(f, a) for f, a in pairs if f not in already_sent_urls]
+        pairs = [(f, a) for f, a in pairs if not is_already_sent(f)]
         if not pairs:
             print("[INFO] Wszystkie znalezione konkursy już wysłane. Kończę.")
-            browser.close()
+            await _shutdown(pool, context, browser)
             return
         print(f"[INFO] Nowych do przetworzenia: {len(pairs)}")
-        to_process = pairs[:max_contests]
-        for contest_idx, (contest_url, article_url) in enumerate(to_process):
-            # Losowe opóźnienie między konkursami (jak człowiek)
-            if contest_idx > 0:
-                delay_s = random.uniform(15, 45)
-                print(f"[HUMAN] Czekam {delay_s:.0f}s przed następnym konkursem...")
-                page.wait_for_timeout(int(delay_s * 1000))
-            today_sent = count_today_sent()
-            if today_sent >= max_daily:
-                print(f"[LIMIT] Osiągnięto {today_sent}/{max_daily} dziennie. Przeskakuję ten konkurs.")
-                status = "SKIPPED_DAILY_LIMIT"
-                log_row(contest_url, article_url, "", "", status, "")
-                continue
-            status = "INIT"
-            q = ""
-            a = "??"
-            fill_stats = ""
+        queue: asyncio.Queue[tuple[str, str | None]] = asyncio.Queue()
+        for pair in pairs[:max_contests]:
+            queue.put_nowait(pair)
+        # limit dzienny: wysłane dziś + konkursy w toku; sprawdzenie i rezerwacja pod jednym lockiem
+        limit_lock = asyncio.Lock()
+        in_flight = 0
+        state_saved = False
+
+        async def worker(wid: int):
+            nonlocal in_flight, state_saved
+            wctx, kw = await new_browser_context(browser)
             try:
-                print(f"\n>>> Konkurs: {contest_url}")
-                if not safe_goto(page, contest_url):
-                    status = "ERROR:NavigationFailed"
-                    continue
-                dismiss_cookies_any(page)
-                scope = find_form_frame(page)
-                # domknij CMP także w ramce
-                dismiss_cookies_any(scope)
-                # Sprawdź czy konkurs wygasł
-                if is_contest_expired(scope):
-                    print("[EXPIRED] Konkurs wygasły — pomijam.")
-                    status = "SKIPPED_EXPIRED"
-                    log_row(contest_url, article_url, "", "", status, "")
-                    continue
-                # Symuluj zachowanie człowieka
-                simulate_human_behavior(page)
-                q = get_question(scope) or ""
-                print(f"[Pytanie] {q}")
-                # --- Rozwiązywanie odpowiedzi ---
-                y = resolve_year(q)
-                extraction = ""
-                if y is not None:
-                    a = str(compute_years_ago(y))
-                    print(f"[Odpowiedz] Rok {y} -> {a} lat temu")
-                    extraction = "YEARS"
-                else:
-                    # Próba ekstrakcji kroków z artykułu
-                    steps = []
-                    if article_url and re.search(r"poprzedniej stronie", q, flags=re.IGNORECASE):
-                        print(f"[DEBUG] ART URL: {article_url}")
-                        steps = extract_three_steps_from_article(context, article_url)
-                        if steps:
-                            extraction = "EXTRACT_STEPS"
-                    # Fallback: szablon
-                    if not steps:
-                        steps = resolve_three_steps_fallback(q)
-                        if steps:
-                            extraction = "TEMPLATE_STEPS"
-                    if steps:
-                        a = "; ".join([f"{i+1}) {s}" for i, s in enumerate(steps)])
-                        tag = "[TEMPLATE]" if extraction == "TEMPLATE_STEPS" else ""
-                        print(f"[Odpowiedz]{tag} {a}")
-                    else:
-                        # Fallback: LLM
-                        llm_answer = ask_llm(q, get_main_text(page) if q else "")
-                        if llm_answer:
-                            a = llm_answer
-                            extraction = "LLM"
-                            print(f"[Odpowiedz][LLM] {a[:200]}")
-                        elif interactive:
-                            print("[Resolver] Wpisz odpowiedź ręcznie (page.pause).")
-                            page.pause()
-                            try:
-                                a = scope.get_by_label("Twoja odpowiedź", exact=False).input_value() or "??"
-                            except Exception:
-                                a = "??"
-                        else:
-                            print("[Resolver] Brak automatycznej odpowiedzi — pomijam.")
-                            a = "??"
-                            extraction = "MANUAL"
-                mapping = scan_fields(scope)
-                if mapping:
-                    print("[DEBUG] mapping:", {k: v for k, v in mapping.items() if k != 'all'})
-                    ok_imie = bool(mapping.get('imie')) and pw_fill_or_js(scope, mapping['imie'], IMIE)
-                    ok_nazw = bool(mapping.get('nazwisko')) and pw_fill_or_js(scope, mapping['nazwisko'], NAZWISKO)
-                    ok_mail = bool(mapping.get('email')) and pw_fill_or_js(scope, mapping['email'], EMAIL)
-                    ok_city = bool(mapping.get('miasto')) and pw_fill_or_js(scope, mapping['miasto'], MIASTO)
-                    ok_ans = bool(mapping.get('odp')) and pw_fill_or_js(scope, mapping['odp'], a)
-                    fill_stats = str({
-                        'imie': bool(ok_imie), 'nazwisko': bool(ok_nazw), 'email': bool(ok_mail), 'miasto': bool(ok_city), 'odp': bool(ok_ans)
-                    })
-                    print("[DEBUG] fill status:", fill_stats)
-                    rodo_cnt = check_rodo_checkboxes(scope)
-                    if rodo_cnt:
-                        print(f"[RODO] Zaznaczono {rodo_cnt} checkboxów")
-                else:
-                    print("[WARN] Brak mappingu pól — formularz może być w nietypowym komponencie.")
-                if dry_run:
-                    print("[DRY-RUN] Pomijam kliknięcie 'Wyślij'.")
-                    status = "DRY_FILLED"
-                else:
-                    cap = detect_captcha(page)
-                    if cap != "none":
-                        print(f"[CAPTCHA] Wykryto: {cap}; tryb: {captcha_mode}")
-                        if captcha_mode == "pause":
-                            if interactive:
-                                page.pause()
-                            else:
-                                print("[CAPTCHA] Tryb pause, ale interactive=false — kontynuuję bez pauzy.")
-                        elif captcha_mode == "wait":
-                            solved = wait_for_captcha_solved(page, timeout_ms=60000)
-                            print(f"[CAPTCHA] solved={solved}")
-                        elif captcha_mode == "skip":
-                            print("[CAPTCHA] Pomijam rozwiązywanie (skip).")
-                    sent = click_submit(scope)
-                    page.wait_for_timeout(2000)
-                    confirmed = has_submission_confirmation(scope)
-                    if sent and confirmed:
-                        if extraction == "TEMPLATE_STEPS":
-                            status = "SENT_TEMPLATE"
-                        elif extraction == "EXTRACT_STEPS":
-                            status = "SENT_EXTRACT"
-                        elif extraction == "YEARS":
-                            status = "SENT_YEARS"
-                        elif extraction == "LLM":
-                            status = "SENT_LLM"
-                        else:
-                            status = "SENT"
-                    elif sent and not confirmed:
-                        status = "SENT_UNCONFIRMED"
-                    else:
-                        status = "NOT_SENT"
-                if save_artifacts:
-                    art_dir = "artifacts"
-                    os.makedirs(art_dir, exist_ok=True)
-                    prefix = os.path.join(art_dir, f"run_{datetime.now(ZoneInfo('Europe/Warsaw')).strftime('%Y%m%d_%H%M%S')}")
-                    dump_artifacts(page, scope, prefix)
-                print(f"[Status] {status}")
-            except Exception as e:
-                status = f"ERROR:{type(e).__name__}:{e}"
-                print(status)
+                await wctx.route("**/*", block_contest_requests)
+                page = await wctx.new_page()
+                # Stealth: ukryj webdriver
+                await page.add_init_script(STEALTH_JS)
+                print(f"[STEALTH][W{wid}] UA: {kw['user_agent'][:50]}... VP: {kw['viewport']['width']}x{kw['viewport']['height']}")
+                first = True
+                while True:
+                    try:
+                        contest_url, article_url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    # Losowe opóźnienie między konkursami tego workera (jak człowiek)
+                    if not first:
+                        delay_s = random.uniform(5, 15)
+                        print(f"[HUMAN][W{wid}] Czekam {delay_s:.0f}s przed następnym konkursem...")
+                        await page.wait_for_timeout(int(delay_s * 1000))
+                    first = False
+                    async with limit_lock:
+                        today_sent = count_today_sent()
+                        allowed = today_sent + in_flight < max_daily
+                        if allowed:
+                            in_flight += 1
+                    if not allowed:
+                        print(f"[LIMIT] Osiągnięto {today_sent}/{max_daily} dziennie (w toku: {in_flight}). Przeskakuję ten konkurs.")
+                        log_row(contest_url, article_url, "", "", "SKIPPED_DAILY_LIMIT", "")
+                        continue
+                    try:
+                        await process_contest(page, pool, contest_url, article_url,
+                                              interactive=interactive, captcha_mode=captcha_mode,
+                                              save_artifacts=save_artifacts, dry_run=dry_run,
+                                              slow_typing=slow_typing)
+                    finally:
+                        async with limit_lock:
+                            in_flight -= 1
+                    if not state_saved and is_already_sent(contest_url):
+                        state_saved = True
+                        try:
+                            await wctx.storage_state(path=STORAGE_STATE_FILE)
+                        except Exception as e:
+                            print(f"[STATE] Błąd zapisu {STORAGE_STATE_FILE}: {e}")
             finally:
-                log_row(contest_url, article_url, q, a, status, fill_stats)
-        browser.close()
+                try:
+                    await wctx.close()
+                except Exception:
+                    pass
 
+        n = max(1, min(concurrency, queue.qsize()))
+        await asyncio.gather(*(worker(i + 1) for i in range(n)))
+        await _shutdown(pool, context, browser)
 
-# ===== RAPORT HTML =====
-REPORT_FILE = "raport.html"
+def run(max_contests: int = 5, max_pages: int = 3, headless: bool = False,
+        interactive: bool = False, captcha_mode: str = "wait", save_artifacts: bool = False,
+        max_daily: int = 3, dry_run: bool = False, pool_size: int = 5,
+        slow_typing: bool = False, concurrency: int = 3):
+    """Synchroniczny punkt wejścia dla CLI — uruchamia pętlę asyncio."""
+    with Logger():
+        asyncio.run(_main(max_contests=max_contests, max_pages=max_pages, headless=headless,
+                          interactive=interactive, captcha_mode=captcha_mode, save_artifacts=save_artifacts,
+                          max_daily=max_daily, dry_run=dry_run, pool_size=pool_size,
+                          slow_typing=slow_typing, concurrency=concurrency))
 
-def generate_report():
-    """Generuje raport HTML z logu CSV."""
-    if not os.path.exists(LOG_FILE):
-        print("[RAPORT] Brak pliku logu — nie ma czego raportować.")
-        return
 
-    rows = []
-    try:
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            rdr = csv.reader(f)
-            header = next(rdr, None)
-            for row in rdr:
-                if row and len(row) >= 6:
-                    rows.append(row)
-    except Exception as e:
-        print(f"[RAPORT] Błąd odczytu logu: {e}")
-        return
+# ===== RAPORT HTML =====
+REPORT_FILE = "raport.html"
 
-    now = datetime.now(ZoneInfo("Europe/Warsaw")).strftime("%Y-%m-%d %H:%M")
-    total = len(rows)
-    sent = sum(1 for r in rows if r[5] in SENT_STATUSES)
-    errors = sum(1 for r in rows if r[5].startswith("ERROR"))
-    expired = sum(1 for r in rows if r[5] == "SKIPPED_EXPIRED")
+# Tekst z logu (pytania, odpowiedzi, URL-e) trafia do HTML — escape jedną tabelą translate
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
 
-    # Grupuj po dacie
-    by_date: dict[str, list] = {}
-    for r in rows:
-        d = r[0].split("T")[0]
-        by_date.setdefault(d, []).append(r)
-
-    table_rows = ""
-    for r in reversed(rows):
-        ts = r[0].replace("T", " ")[:19]
-        url = r[1]
-        url_short = url.split("/")[-1][:40] if url else ""
-        question = (r[3] or "")[:80]
-        answer = (r[4] or "")[:120]
-        status = r[5]
-        # Kolor statusu
-        if status in SENT_STATUSES:
-            color = "#2e7d32"
-            badge = "✅"
-        elif status.startswith("ERROR"):
-            color = "#c62828"
-            badge = "❌"
-        elif status.startswith("SKIPPED"):
-            color = "#f57f17"
-            badge = "⏭️"
-        elif status == "DRY_FILLED":
-            color = "#1565c0"
-            badge = "🧪"
-        else:
-            color = "#555"
-            badge = "⚪"
-        table_rows += f"""        <tr>
-            <td>{ts}</td>
-            <td><a href="{url}" target="_blank" title="{url}">{url_short}</a></td>
-            <td title="{question}">{question}</td>
-            <td title="{answer}">{answer}</td>
-            <td style="color:{color};font-weight:bold">{badge} {status}</td>
-        </tr>\n"""
+def esc(text: str) -> str:
+    return text.translate(_HTML_ESCAPE)
 
-    html = f"""<!DOCTYPE html>
+# Szkielet raportu (CSS + układ) jako stała; wypełniany przez str.format
+_REPORT_SHELL = """<!DOCTYPE html>
 <html lang="pl">
 <head>
     <meta charset="UTF-8">
@@ -1206,14 +2026,14 @@ def generate_report():
 <body>
     <div class="header">
         <h1>🏆 Raport konkursów — portalmedialny.pl</h1>
-        <div class="meta">Wygenerowano: {now} | Uczestnik: {IMIE} {NAZWISKO} ({EMAIL})</div>
+        <div class="meta">Wygenerowano: {now} | Uczestnik: {participant}</div>
     </div>
     <div class="stats">
         <div class="stat"><div class="num">{total}</div><div class="label">Wszystkich</div></div>
         <div class="stat sent"><div class="num">{sent}</div><div class="label">Wysłanych</div></div>
         <div class="stat err"><div class="num">{errors}</div><div class="label">Błędów</div></div>
         <div class="stat exp"><div class="num">{expired}</div><div class="label">Wygasłych</div></div>
-        <div class="stat"><div class="num">{len(by_date)}</div><div class="label">Dni aktywnych</div></div>
+        <div class="stat"><div class="num">{days}</div><div class="label">Dni aktywnych</div></div>
     </div>
     <table>
         <thead><tr><th>Data/czas</th><th>Konkurs</th><th>Pytanie</th><th>Odpowiedź</th><th>Status</th></tr></thead>
@@ -1224,6 +2044,72 @@ def generate_report():
 </body>
 </html>"""
 
+@functools.lru_cache(maxsize=None)
+def _status_style(status: str) -> tuple[str, str]:
+    """Kolor i ikona statusu w raporcie (statusów jest kilka — liczone raz)."""
+    if status in SENT_STATUSES:
+        return "#2e7d32", "✅"
+    if status.startswith("ERROR"):
+        return "#c62828", "❌"
+    if status.startswith("SKIPPED"):
+        return "#f57f17", "⏭️"
+    if status == "DRY_FILLED":
+        return "#1565c0", "🧪"
+    return "#555", "⚪"
+
+
+def _report_row(r: list[str]) -> str:
+    """Jeden wiersz tabeli raportu."""
+    url = esc(r[1])
+    url_short = esc(r[1].rsplit("/", 1)[-1][:40]) if r[1] else ""
+    question = esc((r[3] or "")[:80])
+    answer = esc((r[4] or "")[:120])
+    color, badge = _status_style(r[5])
+    return f"""        <tr>
+            <td>{esc(r[0][:19].replace("T", " "))}</td>
+            <td><a href="{url}" target="_blank" title="{url}">{url_short}</a></td>
+            <td title="{question}">{question}</td>
+            <td title="{answer}">{answer}</td>
+            <td style="color:{color};font-weight:bold">{badge} {esc(r[5])}</td>
+        </tr>\n"""
+
+
+def generate_report():
+    """Generuje raport HTML z logu CSV."""
+    flush_log()
+    if not os.path.exists(LOG_FILE):
+        print("[RAPORT] Brak pliku logu — nie ma czego raportować.")
+        return
+
+    rows = []
+    try:
+        with open(LOG_FILE, "r", encoding="utf-8") as f:
+            rdr = csv.reader(f)
+            header = next(rdr, None)
+            for row in rdr:
+                if row and len(row) >= 6:
+                    rows.append(row)
+    except Exception as e:
+        print(f"[RAPORT] Błąd odczytu logu: {e}")
+        return
+
+    now = datetime.now(_TZ).strftime("%Y-%m-%d %H:%M")
+    total = len(rows)
+    by_status: dict[str, int] = {}
+    for r in rows:
+        by_status[r[5]] = by_status.get(r[5], 0) + 1
+    sent = sum(n for s, n in by_status.items() if s in SENT_STATUSES)
+    errors = sum(n for s, n in by_status.items() if s.startswith("ERROR"))
+    expired = by_status.get("SKIPPED_EXPIRED", 0)
+    days = len({r[0].partition("T")[0] for r in rows})
+
+    table_rows = "".join(map(_report_row, reversed(rows)))
+
+    html = _REPORT_SHELL.format(
+        now=now, participant=esc(f"{IMIE} {NAZWISKO} ({EMAIL})"), total=total, sent=sent,
+        errors=errors, expired=expired, days=days, table_rows=table_rows,
+    )
+
     with open(REPORT_FILE, "w", encoding="utf-8") as f:
         f.write(html)
     print(f"[RAPORT] Zapisano: {REPORT_FILE} ({total} wpisów, {sent} wysłanych)")
@@ -1239,6 +2125,8 @@ if __name__ == "__main__":
     parser.add_argument("--save-artifacts", type=lambda v: v.lower() in ("true", "1", "yes"), default=False, help="Zapisywać zrzuty ekranu i HTML do diagnostyki")
     parser.add_argument("--max-daily", type=int, default=10, help="Maksymalna liczba wysyłek dziennie (lokalna data)")
     parser.add_argument("--dry-run", type=lambda v: v.lower() in ("true", "1", "yes"), default=False, help="Tryb testowy bez kliknięcia 'Wyślij'")
+    parser.add_argument("--concurrency", type=int, default=3, help="Ile konkursów przetwarzać równolegle (osobne konteksty przeglądarki)")
+    parser.add_argument("--slow-typing", type=lambda v: v.lower() in ("true", "1", "yes"), default=False, help="Wpisywanie znak po znaku zamiast fill() (wolniejsze, bardziej 'ludzkie')")
     parser.add_argument("--report", action="store_true", help="Generuj raport HTML z dotychczasowych wyników (bez uruchamiania agenta)")
     args = parser.parse_args()
     if args.report:
@@ -1246,5 +2134,6 @@ if __name__ == "__main__":
     else:
         run(max_contests=args.max_contests, max_pages=args.max_pages, headless=args.headless,
             interactive=args.interactive, captcha_mode=args.captcha_mode, save_artifacts=args.save_artifacts,
-            max_daily=args.max_daily, dry_run=args.dry_run)
+            max_daily=args.max_daily, dry_run=args.dry_run, slow_typing=args.slow_typing,
+            concurrency=args.concurrency)
         generate_report()